@@ -0,0 +1,176 @@
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from sqlalchemy import func, or_
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Nomination, Employee, User, SentimentResult
+from app.ai.sentiment import analyze_nominations
+from app.ai.metrics import analysis_latency_seconds
+from app.ai.results import build_ai_input, upsert_sentiment_result
+from app.feature_store import refresh_nomination_features
+
+# Job states reported by the status endpoint
+PENDING = "pending"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+NOT_FOUND = "not_found"
+
+
+class AnalysisQueue:
+    """
+    In-process queue that scores nominations off the request path.
+
+    Jobs carry only the nomination_id; the worker re-reads the row, so a
+    nomination that is re-saved while its job is still waiting is scored once
+    with the latest text. Each worker takes up to batch_size waiting ids and
+    scores them with one analyze_nominations call, so a burst of submissions
+    fills model batches without one thread per item. At most one job per
+    nomination runs at a time: a re-save while it is running schedules one
+    more run after it finishes.
+    """
+
+    def __init__(self, workers: int, batch_size: int):
+        self.workers = max(1, workers)
+        self.batch_size = max(1, batch_size)
+        self._executor = None
+        self._lock = threading.Lock()
+        self._status = {}      # nomination_id -> {"status", "enqueued_at", "error"}
+        self._waiting = {}     # nomination_ids not started yet, in enqueue order (dict as ordered set)
+        self._running = set()  # nomination_ids with a job in progress
+        self._rerun = set()    # running nomination_ids re-enqueued meanwhile
+        self._batches = 0      # batches submitted and not finished
+
+    def _get_executor(self):
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="analysis")
+        return self._executor
+
+    def enqueue(self, nomination_id: int):
+        with self._lock:
+            self._status[nomination_id] = {"status": PENDING, "enqueued_at": datetime.utcnow(), "error": None}
+            if nomination_id in self._running:
+                self._rerun.add(nomination_id)
+                return
+            self._waiting[nomination_id] = None
+            self._dispatch()
+
+    def _dispatch(self):
+        # Caller holds self._lock. Waiting ids accumulate while every worker is busy
+        # and go out together once one frees up.
+        while self._waiting and self._batches < self.workers:
+            batch = list(self._waiting)[:self.batch_size]
+            for nomination_id in batch:
+                del self._waiting[nomination_id]
+                self._running.add(nomination_id)
+                self._status[nomination_id]["status"] = RUNNING
+            self._batches += 1
+            self._get_executor().submit(self._run, batch)
+
+    def _finish(self, errors: dict):
+        """
+        errors: nomination_id -> error message, or None if it was scored
+        """
+        with self._lock:
+            self._batches -= 1
+            for nomination_id, error in errors.items():
+                self._running.discard(nomination_id)
+                if nomination_id in self._rerun:
+                    # Re-saved while running: score the latest text next, status stays pending
+                    self._rerun.discard(nomination_id)
+                    self._waiting[nomination_id] = None
+                elif error is not None:
+                    entry = self._status.get(nomination_id, {})
+                    self._status[nomination_id] = {
+                        "status": FAILED, "enqueued_at": entry.get("enqueued_at"), "error": error
+                    }
+                else:
+                    entry = self._status.pop(nomination_id, None)
+                    if entry:
+                        analysis_latency_seconds.observe(
+                            (datetime.utcnow() - entry["enqueued_at"]).total_seconds()
+                        )
+            self._dispatch()
+
+    def _run(self, nomination_ids: list):
+        errors = dict.fromkeys(nomination_ids)
+        db = SessionLocal()
+        try:
+            rows = (
+                db.query(Nomination, Employee, User)
+                .join(Employee, Nomination.nominee_id == Employee.id)
+                .join(User, Nomination.manager_id == User.id)
+                .filter(Nomination.id.in_(nomination_ids))
+                .all()
+            )
+            found = {nomination.id for nomination, _, _ in rows}
+            for nomination_id in nomination_ids:
+                if nomination_id not in found:
+                    errors[nomination_id] = f"Nomination {nomination_id} no longer exists"
+
+            if rows:
+                ai_results = analyze_nominations([build_ai_input(n, e) for n, e, _ in rows])
+                for (nomination, employee, manager), ai_result in zip(rows, ai_results):
+                    upsert_sentiment_result(db, nomination, employee, manager, ai_result or {})
+                db.flush()
+                refresh_nomination_features(db, [employee.id for _, employee, _ in rows])
+                db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Error analyzing nominations {nomination_ids}:", e)
+            errors = dict.fromkeys(nomination_ids, str(e))
+        finally:
+            db.close()
+            self._finish(errors)
+
+    def recover(self, db) -> int:
+        """
+        Re-queue nominations whose analysis was lost with a previous process
+        (jobs live only in memory): no SentimentResult yet, or one older than
+        the nomination's last edit. Returns how many were queued.
+        """
+        nomination_ids = [
+            nomination_id for (nomination_id,) in
+            db.query(Nomination.id)
+            .join(Employee, Nomination.nominee_id == Employee.id)
+            .join(User, Nomination.manager_id == User.id)
+            .outerjoin(SentimentResult, SentimentResult.nomination_id == Nomination.id)
+            .filter(or_(
+                SentimentResult.nomination_id.is_(None),
+                # analyzed_at is naive UTC, updated_at is timestamptz
+                SentimentResult.analyzed_at < func.timezone("UTC", Nomination.updated_at),
+            ))
+            .order_by(Nomination.id)
+        ]
+        for nomination_id in nomination_ids:
+            self.enqueue(nomination_id)
+        return len(nomination_ids)
+
+    def status(self, nomination_id: int, db) -> dict:
+        """
+        pending/running/failed come from memory; anything finished is read back
+        from sentiment_results so the answer survives restarts.
+        """
+        with self._lock:
+            entry = self._status.get(nomination_id)
+            if entry:
+                return {"nomination_id": nomination_id, "status": entry["status"],
+                        "analyzed_at": None, "error": entry["error"]}
+
+        sr = db.query(SentimentResult).filter(SentimentResult.nomination_id == nomination_id).first()
+        if sr:
+            return {"nomination_id": nomination_id, "status": DONE, "analyzed_at": sr.analyzed_at, "error": None}
+        return {"nomination_id": nomination_id, "status": NOT_FOUND, "analyzed_at": None, "error": None}
+
+    def pending_count(self) -> int:
+        with self._lock:
+            return sum(1 for e in self._status.values() if e["status"] in (PENDING, RUNNING))
+
+    def shutdown(self, wait: bool = True):
+        if self._executor is not None:
+            self._executor.shutdown(wait=wait)
+            self._executor = None
+
+
+analysis_queue = AnalysisQueue(workers=settings.ANALYSIS_WORKERS, batch_size=settings.INFERENCE_MAX_BATCH_SIZE)
@@ -0,0 +1,113 @@
+"""
+Inference backends for the transformer pipelines used in app/ai/sentiment.py.
+
+"torch" is the default transformers pipeline. "onnx" exports the model to ONNX,
+applies dynamic int8 quantization and serves it through ONNX Runtime behind the
+same pipeline interface.
+
+Export ahead of time (e.g. in the image build) with:
+    python -m app.ai.backends export
+"""
+import os
+import sys
+from app.config import settings
+
+SUPPORTED_BACKENDS = ("torch", "onnx")
+QUANTIZED_FILE_NAME = "model_quantized.onnx"
+
+
+def onnx_model_dir(model_name: str, quantized: bool = True):
+    variant = "int8" if quantized else "fp32"
+    return os.path.join(settings.ONNX_MODEL_DIR, model_name.replace("/", "__"), variant)
+
+
+def _quantization_config():
+    from optimum.onnxruntime.configuration import AutoQuantizationConfig
+
+    target = settings.ONNX_QUANTIZATION
+    if target == "arm64":
+        return AutoQuantizationConfig.arm64(is_static=False, per_channel=False)
+    if target == "avx512":
+        return AutoQuantizationConfig.avx512(is_static=False, per_channel=False)
+    if target == "avx512_vnni":
+        return AutoQuantizationConfig.avx512_vnni(is_static=False, per_channel=False)
+    return AutoQuantizationConfig.avx2(is_static=False, per_channel=False)
+
+
+def export_onnx_model(model_name: str, quantize: bool = True):
+    """
+    Export a sequence-classification model to ONNX (and quantize it); returns the output directory
+    """
+    from optimum.onnxruntime import ORTModelForSequenceClassification, ORTQuantizer
+    from transformers import AutoTokenizer
+
+    fp32_dir = onnx_model_dir(model_name, quantized=False)
+    if not os.path.exists(os.path.join(fp32_dir, "model.onnx")):
+        print(f"Exporting {model_name} to ONNX in {fp32_dir}")
+        model = ORTModelForSequenceClassification.from_pretrained(model_name, export=True)
+        model.save_pretrained(fp32_dir)
+        AutoTokenizer.from_pretrained(model_name).save_pretrained(fp32_dir)
+
+    if not quantize:
+        return fp32_dir
+
+    int8_dir = onnx_model_dir(model_name, quantized=True)
+    if not os.path.exists(os.path.join(int8_dir, QUANTIZED_FILE_NAME)):
+        print(f"Quantizing {model_name} ({settings.ONNX_QUANTIZATION}) into {int8_dir}")
+        quantizer = ORTQuantizer.from_pretrained(fp32_dir)
+        quantizer.quantize(save_dir=int8_dir, quantization_config=_quantization_config())
+        AutoTokenizer.from_pretrained(fp32_dir).save_pretrained(int8_dir)
+    return int8_dir
+
+
+def _build_onnx_pipeline(task: str, model_name: str):
+    from optimum.onnxruntime import ORTModelForSequenceClassification
+    from transformers import pipeline, AutoTokenizer
+
+    quantize = settings.ONNX_QUANTIZATION != "none"
+    model_dir = export_onnx_model(model_name, quantize=quantize)
+    file_name = QUANTIZED_FILE_NAME if quantize else "model.onnx"
+
+    # Follow this process's torch thread count (pinned per worker by app/ai/executor.py)
+    import onnxruntime
+    import torch
+    session_options = onnxruntime.SessionOptions()
+    session_options.intra_op_num_threads = torch.get_num_threads()
+
+    model = ORTModelForSequenceClassification.from_pretrained(
+        model_dir, file_name=file_name, session_options=session_options
+    )
+    tokenizer = AutoTokenizer.from_pretrained(model_dir)
+    return pipeline(task, model=model, tokenizer=tokenizer)
+
+
+def build_pipeline(task: str, model_name: str, backend: str = None):
+    """
+    Same contract as transformers.pipeline(task, model=model_name), on the configured backend
+    """
+    backend = backend or settings.INFERENCE_BACKEND
+    if backend not in SUPPORTED_BACKENDS:
+        raise ValueError(f"Unknown INFERENCE_BACKEND {backend!r}, expected one of {SUPPORTED_BACKENDS}")
+    if backend == "onnx":
+        return _build_onnx_pipeline(task, model_name)
+
+    from transformers import pipeline
+    return pipeline(task, model=model_name)
+
+
+def backend_fingerprint():
+    """
+    Backend details that can change model output (used in the model version)
+    """
+    if settings.INFERENCE_BACKEND == "onnx":
+        return f"onnx:{settings.ONNX_QUANTIZATION}"
+    return settings.INFERENCE_BACKEND
+
+
+if __name__ == "__main__":
+    if sys.argv[1:2] != ["export"]:
+        print(__doc__)
+        sys.exit(1)
+    quantize = settings.ONNX_QUANTIZATION != "none"
+    for name in (settings.SENTIMENT_MODEL, settings.ZERO_SHOT_MODEL):
+        print("Exported:", export_onnx_model(name, quantize=quantize))
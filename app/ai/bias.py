@@ -1,30 +1,77 @@
+import numpy as np
 import pandas as pd
-from sklearn.preprocessing import MinMaxScaler
+
+NUMERIC_COLS = ['jira_tickets', 'slack_activity', 'extra_activities', 'customer_appreciations']
+DEVIATION_THRESHOLD = 0.4  # arbitrary threshold
+
+
+def minmax_normalize(values: np.ndarray):
+    """
+    Column-wise min-max scaling to [0, 1] (constant columns scale to 0, like sklearn's MinMaxScaler)
+    """
+    col_min = np.nanmin(values, axis=0)
+    col_range = np.nanmax(values, axis=0) - col_min
+    col_range[col_range == 0] = 1.0
+    return (values - col_min) / col_range
+
+
+def bias_deviations(employee_data: pd.DataFrame, numeric_cols=NUMERIC_COLS):
+    """
+    Mean absolute deviation of each employee's normalized metrics from their
+    manager's mean, computed in one vectorized pass. Returns a float array
+    aligned with employee_data's rows. The input frame is not modified.
+    """
+    values = minmax_normalize(employee_data[numeric_cols].to_numpy(dtype=np.float64))
+
+    # Per-manager means via group codes + bincount (no Python loop over groups).
+    # Rows without a manager get code -1 and no deviation, as groupby drops them.
+    # Missing values are skipped like pandas' mean does: each column is averaged
+    # over its non-NaN entries only.
+    codes, managers = pd.factorize(employee_data["manager_id"])
+    valid = codes >= 0
+    present = ~np.isnan(values[valid])
+    filled = np.where(present, values[valid], 0.0)
+    counts = np.column_stack([
+        np.bincount(codes[valid], weights=present[:, j], minlength=len(managers))
+        for j in range(values.shape[1])
+    ])
+    sums = np.column_stack([
+        np.bincount(codes[valid], weights=filled[:, j], minlength=len(managers))
+        for j in range(values.shape[1])
+    ])
+    with np.errstate(invalid="ignore", divide="ignore"):
+        group_means = sums / counts  # NaN where a manager has no values in a column
+
+        diffs = np.abs(values[valid] - group_means[codes[valid]])
+        known = ~np.isnan(diffs)
+        deviation = np.full(len(values), np.nan)
+        deviation[valid] = np.where(known, diffs, 0.0).sum(axis=1) / known.sum(axis=1)
+    return deviation
+
+
+def detect_bias_frame(employee_data: pd.DataFrame, threshold: float = DEVIATION_THRESHOLD):
+    """
+    Flagged employees as a DataFrame:
+    ['employee_id','manager_id','bias_flag','deviation_score']
+    """
+    deviation = bias_deviations(employee_data)
+    flagged = np.nan_to_num(deviation, nan=0.0) > threshold
+    return pd.DataFrame({
+        "employee_id": employee_data["employee_id"].to_numpy()[flagged],
+        "manager_id": employee_data["manager_id"].to_numpy()[flagged],
+        "bias_flag": True,
+        "deviation_score": deviation[flagged],
+    })
+
 
 def detect_bias(employee_data: pd.DataFrame):
     """
     employee_data columns:
     ['employee_id','manager_id','jira_tickets','slack_activity',
      'extra_activities','bmi','annual_roles','customer_appreciations']
-    """
 
-    # Normalize numeric fields
-    scaler = MinMaxScaler()
-    numeric_cols = ['jira_tickets','slack_activity','extra_activities','customer_appreciations']
-    employee_data[numeric_cols] = scaler.fit_transform(employee_data[numeric_cols])
-
-    # Compare employees within same manager
-    results = []
-    for manager_id, group in employee_data.groupby("manager_id"):
-        mean_scores = group[numeric_cols].mean()
-        for _, row in group.iterrows():
-            deviation = abs(row[numeric_cols] - mean_scores).mean()
-            if deviation > 0.4:  # arbitrary threshold
-                results.append({
-                    "employee_id": row["employee_id"],
-                    "manager_id": manager_id,
-                    "bias_flag": True,
-                    "deviation_score": deviation
-                })
-
-    return results
+    Returns a list of {employee_id, manager_id, bias_flag, deviation_score},
+    grouped by manager like the original groupby loop.
+    """
+    flagged = detect_bias_frame(employee_data)
+    return flagged.sort_values("manager_id", kind="stable").to_dict("records")
@@ -0,0 +1,71 @@
+from sqlalchemy import func, true
+from sqlalchemy.orm import Session
+from app.models import Employee, EmployeeMetrics
+from app.ai.bias import NUMERIC_COLS, DEVIATION_THRESHOLD
+
+
+def detect_bias_sql(db: Session, manager_id: int = None, threshold: float = DEVIATION_THRESHOLD):
+    """
+    detect_bias pushed down to the database over employee_metrics.
+
+    The population is the one load_feature_frame gives detect_bias and the
+    streaming tracker: every employee with a manager, with zeros for missing
+    metrics. Min-max bounds are taken over the whole org, per-manager means
+    come from AVG() OVER (PARTITION BY manager_id), and only flagged
+    employees are returned, so API memory does not grow with the org.
+    """
+    metric_cols = {name: func.coalesce(getattr(EmployeeMetrics, name), 0) for name in NUMERIC_COLS}
+
+    def population(query):
+        return (
+            query.outerjoin(EmployeeMetrics, EmployeeMetrics.employee_id == Employee.id)
+            .filter(Employee.manager_id.isnot(None))
+        )
+
+    bounds = population(
+        db.query(
+            *[func.min(col).label(f"{name}_min") for name, col in metric_cols.items()],
+            *[func.max(col).label(f"{name}_max") for name, col in metric_cols.items()],
+        ).select_from(Employee)
+    ).subquery("bounds")
+
+    # Constant columns scale to 0, like MinMaxScaler
+    scaled_cols = [
+        func.coalesce(
+            (col - bounds.c[f"{name}_min"]) / func.nullif(bounds.c[f"{name}_max"] - bounds.c[f"{name}_min"], 0),
+            0,
+        ).label(name)
+        for name, col in metric_cols.items()
+    ]
+    scaled = population(
+        db.query(Employee.id.label("employee_id"), Employee.manager_id.label("manager_id"), *scaled_cols)
+    ).join(bounds, true())
+    if manager_id is not None:
+        # Safe before the window: partitions are per manager anyway
+        scaled = scaled.filter(Employee.manager_id == manager_id)
+    scaled = scaled.subquery("scaled")
+
+    deviation = sum(
+        func.abs(scaled.c[name] - func.avg(scaled.c[name]).over(partition_by=scaled.c.manager_id))
+        for name in NUMERIC_COLS
+    ) / len(NUMERIC_COLS)
+
+    deviations = db.query(
+        scaled.c.employee_id, scaled.c.manager_id, deviation.label("deviation_score")
+    ).subquery("deviations")
+
+    rows = (
+        db.query(deviations)
+        .filter(deviations.c.deviation_score > threshold)
+        .order_by(deviations.c.manager_id, deviations.c.employee_id)
+        .all()
+    )
+    return [
+        {
+            "employee_id": r.employee_id,
+            "manager_id": r.manager_id,
+            "bias_flag": True,
+            "deviation_score": float(r.deviation_score),
+        }
+        for r in rows
+    ]
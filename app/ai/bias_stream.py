@@ -0,0 +1,193 @@
+import threading
+import numpy as np
+from app.ai.bias import NUMERIC_COLS, DEVIATION_THRESHOLD
+
+
+class RunningStats:
+    """
+    Welford running mean/variance over vectors, with O(1) add and remove
+    """
+
+    def __init__(self, size: int):
+        self.count = 0
+        self.mean = np.zeros(size)
+        self.m2 = np.zeros(size)
+
+    def add(self, x: np.ndarray):
+        self.count += 1
+        delta = x - self.mean
+        self.mean += delta / self.count
+        self.m2 += delta * (x - self.mean)
+
+    def remove(self, x: np.ndarray):
+        if self.count <= 1:
+            self.count = 0
+            self.mean[:] = 0
+            self.m2[:] = 0
+            return
+        delta = x - self.mean
+        self.count -= 1
+        self.mean -= delta / self.count
+        self.m2 -= delta * (x - self.mean)
+        np.maximum(self.m2, 0, out=self.m2)
+
+    @property
+    def variance(self):
+        return self.m2 / self.count if self.count else np.zeros_like(self.m2)
+
+
+class IncrementalBiasTracker:
+    """
+    Per-manager bias statistics maintained as activity data arrives.
+
+    Each observation replaces (observe) or adds to (increment) an employee's
+    metrics and updates that manager's running mean/variance and the global
+    per-feature min/max in O(1). Deviation flags use the same definition as
+    app.ai.bias.detect_bias: mean absolute distance from the manager's mean
+    after min-max scaling.
+
+    The global min/max only widen as values arrive; call rebuild_bounds() to
+    shrink them after employees leave.
+
+    The app seeds the tracker from employee_metrics at startup, and
+    app.feature_store.upsert_features keeps it current as collectors refresh.
+    """
+
+    def __init__(self, features=NUMERIC_COLS, threshold: float = DEVIATION_THRESHOLD):
+        self.features = list(features)
+        self.threshold = threshold
+        self._employees = {}   # employee_id -> (manager_id, metrics vector)
+        self._managers = {}    # manager_id -> RunningStats
+        self._min = np.full(len(self.features), np.inf)
+        self._max = np.full(len(self.features), -np.inf)
+        self._lock = threading.Lock()
+
+    def _vector(self, metrics: dict):
+        return np.array([float(metrics.get(f) or 0) for f in self.features])
+
+    def _detach(self, employee_id):
+        previous = self._employees.pop(employee_id, None)
+        if previous is None:
+            return None
+        manager_id, values = previous
+        stats = self._managers.get(manager_id)
+        if stats is not None:
+            stats.remove(values)
+            if stats.count == 0:
+                del self._managers[manager_id]
+        return values
+
+    def _attach(self, employee_id, manager_id, values: np.ndarray):
+        self._employees[employee_id] = (manager_id, values)
+        self._managers.setdefault(manager_id, RunningStats(len(self.features))).add(values)
+        np.minimum(self._min, values, out=self._min)
+        np.maximum(self._max, values, out=self._max)
+
+    def observe(self, employee_id, manager_id, metrics: dict):
+        """
+        Set an employee's current metrics (missing features count as 0)
+        """
+        values = self._vector(metrics)
+        with self._lock:
+            self._detach(employee_id)
+            self._attach(employee_id, manager_id, values)
+
+    def increment(self, employee_id, manager_id, deltas: dict):
+        """
+        Add to an employee's metrics, e.g. one more Jira ticket
+        """
+        with self._lock:
+            previous = self._detach(employee_id)
+            values = self._vector(deltas) + (previous if previous is not None else 0)
+            self._attach(employee_id, manager_id, values)
+
+    def update(self, employee_id, manager_id, metrics: dict):
+        """
+        Set only the given features, keeping the employee's other metrics
+        """
+        with self._lock:
+            previous = self._detach(employee_id)
+            values = previous.copy() if previous is not None else np.zeros(len(self.features))
+            for i, f in enumerate(self.features):
+                if f in metrics:
+                    values[i] = float(metrics[f] or 0)
+            self._attach(employee_id, manager_id, values)
+
+    def seed(self, frame):
+        """
+        Replace all tracked employees with the rows of a feature frame
+        (app.feature_store.load_feature_frame); rows without a manager are skipped
+        """
+        frame = frame[frame["manager_id"].notna()]
+        with self._lock:
+            self._employees.clear()
+            self._managers.clear()
+            self._min[:] = np.inf
+            self._max[:] = -np.inf
+            for row in frame.itertuples(index=False):
+                metrics = {f: getattr(row, f) for f in self.features}
+                self._attach(str(row.employee_id), int(row.manager_id), self._vector(metrics))
+
+    def remove(self, employee_id):
+        with self._lock:
+            self._detach(employee_id)
+
+    def rebuild_bounds(self):
+        with self._lock:
+            if not self._employees:
+                self._min[:] = np.inf
+                self._max[:] = -np.inf
+                return
+            all_values = np.vstack([values for _, values in self._employees.values()])
+            self._min = all_values.min(axis=0)
+            self._max = all_values.max(axis=0)
+
+    def _scale(self):
+        scale = self._max - self._min
+        scale[~np.isfinite(scale) | (scale == 0)] = 1.0
+        return scale
+
+    def deviation(self, employee_id):
+        with self._lock:
+            manager_id, values = self._employees[employee_id]
+            stats = self._managers[manager_id]
+            return float((np.abs(values - stats.mean) / self._scale()).mean())
+
+    def flags(self, manager_id=None, threshold: float = None):
+        """
+        Employees whose deviation exceeds the threshold (optionally for one manager)
+        """
+        threshold = self.threshold if threshold is None else threshold
+        with self._lock:
+            scale = self._scale()
+            results = []
+            for employee_id, (mgr_id, values) in self._employees.items():
+                if manager_id is not None and mgr_id != manager_id:
+                    continue
+                deviation = float((np.abs(values - self._managers[mgr_id].mean) / scale).mean())
+                if deviation > threshold:
+                    results.append({
+                        "employee_id": employee_id,
+                        "manager_id": mgr_id,
+                        "bias_flag": True,
+                        "deviation_score": deviation,
+                    })
+            return results
+
+    def manager_stats(self, manager_id):
+        with self._lock:
+            stats = self._managers.get(manager_id)
+            if stats is None:
+                return None
+            return {
+                "manager_id": manager_id,
+                "employees": stats.count,
+                "mean": dict(zip(self.features, stats.mean.tolist())),
+                "variance": dict(zip(self.features, stats.variance.tolist())),
+            }
+
+    def __len__(self):
+        return len(self._employees)
+
+
+bias_tracker = IncrementalBiasTracker()
@@ -0,0 +1,122 @@
+import hashlib
+import threading
+import unicodedata
+from collections import OrderedDict
+from sqlalchemy.dialects.postgresql import insert
+from app.db import SessionLocal
+from app.models import InferenceCache
+from app.ai.metrics import inference_cache_hits, inference_cache_misses
+
+# Fields of an analysis result that depend only on (comment, claimed core value, model version)
+CACHED_FIELDS = ("sentiment_label", "sentiment_score", "predicted_core_value", "core_value_alignment")
+
+
+def normalize_comment(comment: str):
+    """
+    Unicode + whitespace normalization so trivially different texts share a key
+    """
+    return " ".join(unicodedata.normalize("NFKC", comment or "").split())
+
+
+def normalize_core_value(core_value: str):
+    """
+    The claimed core value as both the cache key and the alignment score see it
+    """
+    return (core_value or "").strip()
+
+
+def cache_key(comment: str, core_value_claimed: str, model_version: str):
+    payload = "\x1f".join([normalize_comment(comment), normalize_core_value(core_value_claimed), model_version])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisResultCache:
+    """
+    Two-tier cache of analysis results: an in-memory LRU in front of the
+    inference_cache table, so hits survive restarts and are shared by workers.
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _remember(self, key: str, value: dict):
+        with self._lock:
+            self._entries[key] = value
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def get(self, key: str):
+        return self.get_many([key]).get(key)
+
+    def get_many(self, keys) -> dict:
+        """
+        key -> cached fields for every key found; memory first, then one
+        IN (...) query for the rest.
+        """
+        found = {}
+        with self._lock:
+            for key in keys:
+                value = self._entries.get(key)
+                if value is not None:
+                    self._entries.move_to_end(key)
+                    found[key] = value
+        if found:
+            inference_cache_hits.labels(tier="memory").inc(len(found))
+
+        missing = list({key for key in keys if key not in found})
+        if not missing:
+            return found
+
+        db = SessionLocal()
+        try:
+            rows = db.query(InferenceCache).filter(InferenceCache.cache_key.in_(missing)).all()
+        except Exception as e:
+            print("Error reading inference cache:", e)
+            rows = []
+        finally:
+            db.close()
+
+        for row in rows:
+            value = {field: getattr(row, field) for field in CACHED_FIELDS}
+            self._remember(row.cache_key, value)
+            found[row.cache_key] = value
+        if rows:
+            inference_cache_hits.labels(tier="db").inc(len(rows))
+        if len(missing) > len(rows):
+            inference_cache_misses.inc(len(missing) - len(rows))
+        return found
+
+    def put(self, key: str, model_version: str, result: dict):
+        self.put_many(model_version, {key: result})
+
+    def put_many(self, model_version: str, results: dict):
+        """
+        results: key -> analysis result. One INSERT ... ON CONFLICT DO NOTHING,
+        since another worker may have stored some of the keys first.
+        """
+        if not results:
+            return
+        values = {key: {field: result.get(field) for field in CACHED_FIELDS} for key, result in results.items()}
+        for key, value in values.items():
+            self._remember(key, value)
+
+        db = SessionLocal()
+        try:
+            db.execute(
+                insert(InferenceCache)
+                .values([{"cache_key": key, "model_version": model_version, **value} for key, value in values.items()])
+                .on_conflict_do_nothing(index_elements=[InferenceCache.cache_key])
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print("Error writing inference cache:", e)
+        finally:
+            db.close()
+
+    def clear_memory(self):
+        with self._lock:
+            self._entries.clear()
@@ -0,0 +1,72 @@
+import numpy as np
+
+# Sacumen core values
+CORE_VALUES = ["Customer delight", "Innovation", "Team work", "Being fair", "Ownership"]
+
+# Short descriptions used as the embedding targets for each core value
+CORE_VALUE_DESCRIPTIONS = {
+    "Customer delight": "Went above and beyond for the customer or client, exceeded their expectations and earned their appreciation.",
+    "Innovation": "Came up with a new idea, tool, automation or creative approach that improved how work gets done.",
+    "Team work": "Collaborated closely with colleagues, helped teammates and supported the team to deliver together.",
+    "Being fair": "Acted with honesty, integrity and fairness, treated everyone equally and transparently.",
+    "Ownership": "Took full responsibility and accountability for a task, drove it to completion without being asked.",
+}
+
+
+class EmbeddingCoreValueClassifier:
+    """
+    Core value prediction with a single encoder pass per justification.
+
+    Core value descriptions are embedded once when the classifier is built;
+    each justification is embedded and matched to the closest description
+    by cosine similarity.
+    """
+
+    def __init__(self, model_name: str, labels=CORE_VALUES, descriptions=CORE_VALUE_DESCRIPTIONS, batch_size: int = 16):
+        from transformers import AutoTokenizer, AutoModel
+
+        self.model_name = model_name
+        self.labels = list(labels)
+        self.batch_size = batch_size
+        self.tokenizer = AutoTokenizer.from_pretrained(model_name)
+        self.model = AutoModel.from_pretrained(model_name)
+        self.model.eval()
+
+        # (n_labels, dim) matrix of L2-normalized description embeddings
+        self.label_embeddings = self.embed([descriptions.get(label, label) for label in self.labels])
+
+    def embed(self, texts: list):
+        """
+        Mean-pooled, L2-normalized sentence embeddings, shape (len(texts), dim)
+        """
+        import torch
+
+        chunks = []
+        for i in range(0, len(texts), self.batch_size):
+            encoded = self.tokenizer(
+                texts[i:i + self.batch_size], padding=True, truncation=True, return_tensors="pt"
+            )
+            with torch.no_grad():
+                hidden = self.model(**encoded).last_hidden_state
+            mask = encoded["attention_mask"].unsqueeze(-1).to(hidden.dtype)
+            pooled = (hidden * mask).sum(dim=1) / mask.sum(dim=1).clamp(min=1e-9)
+            chunks.append(pooled.numpy())
+
+        vectors = np.vstack(chunks)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.clip(norms, 1e-12, None)
+
+    def scores(self, texts: list):
+        """
+        Cosine similarity of every text against every core value, shape (len(texts), n_labels)
+        """
+        if not texts:
+            return np.zeros((0, len(self.labels)))
+        return self.embed(texts) @ self.label_embeddings.T
+
+    def classify(self, texts: list):
+        """
+        Top core value per text
+        """
+        best = self.scores(texts).argmax(axis=1)
+        return [self.labels[i] for i in best]
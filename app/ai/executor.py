@@ -0,0 +1,185 @@
+"""
+Dedicated process pool for model inference.
+
+The API process keeps the event loop and request threads; model calls from
+app/ai/sentiment.py are shipped to a fixed pool of worker processes, each with
+a pinned torch thread count so the pool cannot oversubscribe the cores.
+
+With the torch backend the models are loaded in the parent before the workers
+are forked, so the weights are shared copy-on-write. ONNX Runtime sessions are
+not fork-safe, so with the onnx backend each worker loads its own copy.
+
+If a worker dies (OOM kill, segfault) the pool is broken for good; run()
+then drops it, serves the call in-process and rebuilds the pool in the
+background. A call that outlives INFERENCE_TIMEOUT_SECONDS also replaces the
+pool (its hung workers are terminated) and fails. By then the parent may have
+run forward passes and has other threads holding locks, so rebuilt pools
+start their workers from a fresh interpreter (forkserver/spawn) instead of
+forking. /readyz reports not ready until the new pool is up.
+"""
+import multiprocessing
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor, TimeoutError as FutureTimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from app.config import settings
+from app.ai.registry import model_registry
+
+
+def _init_worker(torch_threads: int, load_models: bool):
+    # The forked copy of the executor must not dispatch back into the pool
+    inference_executor._detach()
+
+    import torch
+    torch.set_num_threads(torch_threads)
+    try:
+        torch.set_num_interop_threads(1)
+    except RuntimeError:
+        # Already fixed once inter-op work has started in the parent
+        pass
+
+    if load_models:
+        import app.ai.sentiment  # noqa: F401  registers the models (spawned workers start empty)
+        model_registry.warmup()
+
+
+def _ping():
+    return True
+
+
+class InferenceExecutor:
+    def __init__(self, processes: int, torch_threads: int):
+        self.processes = processes
+        self.torch_threads = max(1, torch_threads)
+        self._pool = None
+        self._ready = threading.Event()
+        self._lock = threading.Lock()
+        self._closed = False
+        self.restarts = 0
+
+    @property
+    def enabled(self):
+        return self.processes > 0
+
+    @property
+    def running(self):
+        return self._pool is not None and self._ready.is_set()
+
+    @property
+    def ready(self):
+        return self._ready.is_set()
+
+    def start(self):
+        """
+        Load models (torch: in the parent, before fork) and start every worker
+        process. On failure the pool is dropped again, so a later start() retries.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._pool is not None or self._closed:
+                return
+
+            start_method = self._start_method()
+            fork_shared = settings.INFERENCE_BACKEND == "torch" and start_method == "fork"
+            # Load weights only; no forward pass in the parent before fork
+            if fork_shared and not model_registry.warmup():
+                raise RuntimeError("model warmup failed")
+
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.processes,
+                mp_context=multiprocessing.get_context(start_method),
+                initializer=_init_worker,
+                initargs=(self.torch_threads, not fork_shared),
+            )
+            try:
+                # Start all workers now, while the parent holds the loaded weights
+                for future in [self._pool.submit(_ping) for _ in range(self.processes)]:
+                    future.result()
+            except Exception:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+                self._pool = None
+                raise
+
+            self._ready.set()
+            print(f"Inference pool ready: {self.processes} processes x {self.torch_threads} torch threads")
+
+    def _start_method(self):
+        methods = multiprocessing.get_all_start_methods()
+        if self.restarts == 0 and "fork" in methods:
+            return "fork"
+        # Rebuilt pool: never fork the (now multi-threaded, model-running) parent
+        return "forkserver" if "forkserver" in methods else "spawn"
+
+    def start_in_background(self, retry_seconds: float = 5, max_retry_seconds: float = 300):
+        """
+        start() in a thread, retried with exponential backoff until it succeeds or shutdown()
+        """
+        def target():
+            delay = retry_seconds
+            while not self._closed:
+                try:
+                    self.start()
+                    return
+                except Exception as e:
+                    print(f"Error starting inference pool, retrying in {delay:.0f}s:", e)
+                time.sleep(delay)
+                delay = min(delay * 2, max_retry_seconds)
+
+        thread = threading.Thread(target=target, name="inference-pool-start", daemon=True)
+        thread.start()
+        return thread
+
+    def run(self, fn, *args):
+        """
+        Run fn(*args) in a worker process and wait for the result, at most
+        INFERENCE_TIMEOUT_SECONDS (then TimeoutError)
+        """
+        pool = self._pool
+        if pool is None:
+            # Dropped by a concurrent restart since the caller checked `running`
+            return fn(*args)
+        try:
+            return pool.submit(fn, *args).result(timeout=settings.INFERENCE_TIMEOUT_SECONDS)
+        except BrokenProcessPool as e:
+            print("Inference pool broken, restarting:", e)
+            self._restart(pool)
+            return fn(*args)
+        except FutureTimeoutError:
+            print(f"Inference call exceeded {settings.INFERENCE_TIMEOUT_SECONDS}s, restarting pool")
+            self._restart(pool, terminate=True)
+            raise TimeoutError(f"Inference call exceeded {settings.INFERENCE_TIMEOUT_SECONDS}s")
+
+    def _restart(self, old_pool, terminate: bool = False):
+        with self._lock:
+            # Concurrent callers see the same failed pool; only the first one replaces it
+            if self._pool is not old_pool:
+                return
+            self._ready.clear()
+            self._pool = None
+            self.restarts += 1
+        if terminate:
+            # A hung worker never picks up the shutdown; ProcessPoolExecutor has no public kill
+            for process in list((getattr(old_pool, "_processes", None) or {}).values()):
+                process.terminate()
+        old_pool.shutdown(wait=False, cancel_futures=True)
+        self.start_in_background()
+
+    def _detach(self):
+        self._pool = None
+        self._ready.clear()
+        self.processes = 0
+
+    def shutdown(self):
+        with self._lock:
+            self._closed = True
+            if self._pool is not None:
+                self._pool.shutdown(wait=True)
+                self._pool = None
+            self._ready.clear()
+
+
+inference_executor = InferenceExecutor(
+    processes=settings.INFERENCE_PROCESSES,
+    torch_threads=settings.INFERENCE_TORCH_THREADS,
+)
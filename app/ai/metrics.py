@@ -0,0 +1,92 @@
+import time
+from contextlib import contextmanager
+from prometheus_client import Counter, Gauge, Histogram
+
+# ---- Nomination analysis Prometheus metrics ----
+inference_cache_hits = Counter(
+    "nomination_inference_cache_hits_total", "Nomination analyses served from the inference cache", ["tier"]
+)
+inference_cache_misses = Counter(
+    "nomination_inference_cache_misses_total", "Nomination analyses that missed the inference cache"
+)
+sentiment_tier_total = Counter(
+    "nomination_sentiment_tier_total", "Comments scored per sentiment tier (lexicon fast path or transformer)", ["tier"]
+)
+
+# ---- Inference latency and inputs ----
+inference_stage_seconds = Histogram(
+    "nomination_inference_stage_seconds",
+    "Time spent per analysis stage (sentiment, core_value per model call; total per nomination)",
+    ["stage"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+input_tokens = Histogram(
+    "nomination_input_tokens", "Tokens per justification as seen by each model (sampled per call)", ["model"],
+    buckets=(16, 32, 64, 128, 256, 512, 1024, 2048),
+)
+input_truncated_total = Counter(
+    "nomination_input_truncated_total", "Justifications longer than the model's max input length", ["model"]
+)
+inference_batch_size = Histogram(
+    "nomination_inference_batch_size", "Comments per model call", ["model"],
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128),
+)
+inference_errors_total = Counter(
+    "nomination_inference_errors_total", "Failed model calls", ["model"]
+)
+analysis_latency_seconds = Histogram(
+    "nomination_analysis_latency_seconds",
+    "Time from a nomination being queued for analysis to its stored result (submit-to-scored)",
+    buckets=(0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300),
+)
+inference_pool_seconds = Histogram(
+    "nomination_inference_pool_seconds",
+    "Round trip of model calls run in the inference process pool (queueing, transfer and the call)",
+    ["model"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30),
+)
+
+
+class InferenceStats:
+    """
+    Metric observations made during model calls, applied to the registry by
+    record(). Calls that run in an inference pool worker collect here and the
+    API process records the batch, since /metrics never sees the workers'
+    registries. Picklable: metrics are referenced by their name in this module.
+
+    immediate=True applies every observation at once (in-process callers).
+    """
+
+    def __init__(self, immediate: bool = False):
+        self.immediate = immediate
+        self.events = []   # (metric name, labels, "inc" | "observe", value)
+
+    def _add(self, metric: str, labels: dict, method: str, value):
+        if self.immediate:
+            getattr(globals()[metric].labels(**labels), method)(value)
+        else:
+            self.events.append((metric, labels, method, value))
+
+    def inc(self, metric: str, amount=1, **labels):
+        self._add(metric, labels, "inc", amount)
+
+    def observe(self, metric: str, value, **labels):
+        self._add(metric, labels, "observe", value)
+
+    @contextmanager
+    def time(self, metric: str, **labels):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(metric, time.perf_counter() - start, **labels)
+
+    def record(self):
+        events, self.events = self.events, []
+        for metric, labels, method, value in events:
+            getattr(globals()[metric].labels(**labels), method)(value)
+
+# ---- Model lifecycle ----
+model_loaded = Gauge("nomination_model_loaded", "Whether the model is currently loaded (1) or not (0)", ["model"])
+model_load_seconds = Gauge("nomination_model_load_seconds", "Time taken by the last load of the model", ["model"])
+model_resident_bytes = Gauge("nomination_model_resident_bytes", "Approximate resident memory of the loaded model", ["model"])
@@ -0,0 +1,303 @@
+"""
+Bulk re-analysis of nominations stored in the database.
+
+Nominations are streamed in id order (keyset chunks), scored in batches across
+a process pool and bulk-upserted into sentiment_results. Progress is stored in
+reanalysis_jobs after every chunk, so an interrupted job resumes where it stopped.
+
+Usage (from the repo root):
+    python -m app.ai.reanalysis --type monthly --from 2025-01-01 --to 2025-06-30 --manager-id 3
+    python -m app.ai.reanalysis --stale          # only rows scored by another model/label-set version
+    python -m app.ai.reanalysis --resume 12
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import threading
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta
+from sqlalchemy import or_
+from sqlalchemy.dialects.postgresql import insert
+from app.config import settings
+from app.db import SessionLocal
+from app.models import Nomination, Employee, User, SentimentResult, ReanalysisJob, NominationTypeEnum
+from app.feature_store import refresh_nomination_features
+from app.ai.results import AI_RESULT_FIELDS, build_ai_input, sentiment_result_values
+
+# Job ids currently running in this process (API-triggered jobs run in threads)
+_running_jobs = set()
+_running_lock = threading.Lock()
+
+
+# ----------------------------
+# Selecting nominations
+# ----------------------------
+def parse_created_bound(value: str):
+    """
+    An ISO date or datetime filter bound as (datetime, whole_day); whole_day
+    is True for a plain date. Raises ValueError for anything else.
+    """
+    try:
+        return datetime.combine(date.fromisoformat(value), datetime.min.time()), True
+    except ValueError:
+        return datetime.fromisoformat(value), False
+
+
+def filtered_nominations(db, filters: dict):
+    """
+    (Nomination, Employee, User) rows matching the job filters
+    """
+    query = (
+        db.query(Nomination, Employee, User)
+        .join(Employee, Nomination.nominee_id == Employee.id)
+        .join(User, Nomination.manager_id == User.id)
+    )
+    if filters.get("nomination_type"):
+        query = query.filter(Nomination.nomination_type == NominationTypeEnum(filters["nomination_type"]))
+    if filters.get("created_from"):
+        query = query.filter(Nomination.created_at >= parse_created_bound(filters["created_from"])[0])
+    if filters.get("created_to"):
+        created_to, whole_day = parse_created_bound(filters["created_to"])
+        if whole_day:
+            # A plain date includes that whole day
+            query = query.filter(Nomination.created_at < created_to + timedelta(days=1))
+        else:
+            query = query.filter(Nomination.created_at <= created_to)
+    if filters.get("manager_id"):
+        query = query.filter(Nomination.manager_id == filters["manager_id"])
+    if filters.get("stale_only"):
+        # Never scored, or scored by a different model/label-set version
+        from app.ai.sentiment import MODEL_VERSION
+        query = (
+            query.outerjoin(SentimentResult, SentimentResult.nomination_id == Nomination.id)
+            .filter(or_(
+                SentimentResult.nomination_id.is_(None),
+                SentimentResult.model_version.is_(None),
+                SentimentResult.model_version != MODEL_VERSION,
+            ))
+        )
+    return query
+
+
+def iter_nomination_chunks(db, filters: dict, after_id: int = 0, chunk_size: int = 256):
+    """
+    Keyset pagination over the filtered nominations; yields lists of row tuples
+    """
+    while True:
+        rows = (
+            filtered_nominations(db, filters)
+            .filter(Nomination.id > after_id)
+            .order_by(Nomination.id)
+            .limit(chunk_size)
+            .all()
+        )
+        if not rows:
+            return
+        # Read before yielding: the caller's commits expire the ORM rows
+        last_id = rows[-1][0].id
+        yield rows
+        after_id = last_id
+
+
+# ----------------------------
+# Scoring (runs in worker processes)
+# ----------------------------
+def _init_worker(torch_threads: int):
+    import torch
+    torch.set_num_threads(torch_threads)
+
+    from app.ai.registry import model_registry
+    import app.ai.sentiment  # noqa: F401  registers the models
+    model_registry.warmup()
+
+
+def _score_chunk(ai_inputs: list):
+    from app.ai.sentiment import analyze_nominations
+    return analyze_nominations(ai_inputs)
+
+
+# ----------------------------
+# Writing results
+# ----------------------------
+def bulk_upsert_sentiment_results(db, rows: list):
+    """
+    One INSERT ... ON CONFLICT (nomination_id) DO UPDATE for a list of SentimentResult value dicts
+    """
+    if not rows:
+        return
+    stmt = insert(SentimentResult).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[SentimentResult.nomination_id],
+        set_={column: stmt.excluded[column] for column in rows[0] if column != "nomination_id"},
+    )
+    db.execute(stmt)
+
+
+def _commit_chunk(db, job, chunk, future, progress=None):
+    last_id, base_rows = chunk
+    results = future.result()
+
+    rows = []
+    for base, ai_result in zip(base_rows, results):
+        row = dict(base)
+        row.update({field: ai_result.get(field) for field in AI_RESULT_FIELDS})
+        row["analyzed_at"] = datetime.utcnow()
+        rows.append(row)
+
+    bulk_upsert_sentiment_results(db, rows)
+    refresh_nomination_features(db, [row["employee_id"] for row in rows])
+    job.last_nomination_id = last_id
+    job.processed = (job.processed or 0) + len(rows)
+    db.commit()
+
+    if progress:
+        progress(job)
+
+
+# ----------------------------
+# Jobs
+# ----------------------------
+def create_job(db, filters: dict):
+    job = ReanalysisJob(status="pending", filters=json.dumps(filters), last_nomination_id=0, processed=0)
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+    return job
+
+
+def run_job(job_id: int, workers: int = None, chunk_size: int = None, progress=None):
+    """
+    Run (or resume) a re-analysis job until every matching nomination is re-scored
+    """
+    workers = max(1, workers or settings.REANALYSIS_WORKERS)
+    chunk_size = chunk_size or settings.REANALYSIS_CHUNK_SIZE
+
+    with _running_lock:
+        if job_id in _running_jobs:
+            raise RuntimeError(f"Re-analysis job {job_id} is already running")
+        _running_jobs.add(job_id)
+
+    db = SessionLocal()
+    try:
+        job = db.query(ReanalysisJob).filter(ReanalysisJob.id == job_id).first()
+        if job is None:
+            raise LookupError(f"Re-analysis job {job_id} not found")
+
+        filters = json.loads(job.filters or "{}")
+        job.status = "running"
+        job.error = None
+        if job.total is None:
+            job.total = filtered_nominations(db, filters).count()
+        db.commit()
+
+        # Split the cores between workers so torch does not oversubscribe them
+        torch_threads = max(1, (os.cpu_count() or 1) // workers)
+        ctx = multiprocessing.get_context("spawn")
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers, mp_context=ctx, initializer=_init_worker, initargs=(torch_threads,)
+            ) as pool:
+                in_flight = deque()
+                for rows in iter_nomination_chunks(db, filters, job.last_nomination_id, chunk_size):
+                    # Capture plain values now; committing a chunk expires the ORM rows
+                    ai_inputs = [build_ai_input(n, e) for n, e, _ in rows]
+                    base_rows = [sentiment_result_values(n, e, m, None) for n, e, m in rows]
+                    chunk = (rows[-1][0].id, base_rows)
+                    in_flight.append((chunk, pool.submit(_score_chunk, ai_inputs)))
+
+                    if len(in_flight) >= workers * 2:
+                        _commit_chunk(db, job, *in_flight.popleft(), progress=progress)
+
+                while in_flight:
+                    _commit_chunk(db, job, *in_flight.popleft(), progress=progress)
+        except Exception as e:
+            db.rollback()
+            job.status = "failed"
+            job.error = str(e)
+            db.commit()
+            print(f"Re-analysis job {job_id} failed:", e)
+            raise
+
+        job.status = "done"
+        job.finished_at = datetime.utcnow()
+        db.commit()
+        db.refresh(job)
+        return job
+    finally:
+        db.close()
+        with _running_lock:
+            _running_jobs.discard(job_id)
+
+
+def start_job_in_background(job_id: int):
+    """
+    Run a job on a daemon thread (used by the superadmin endpoint)
+    """
+    def target():
+        try:
+            run_job(job_id)
+        except Exception as e:
+            print(f"Re-analysis job {job_id} stopped:", e)
+
+    thread = threading.Thread(target=target, name=f"reanalysis-{job_id}", daemon=True)
+    thread.start()
+    return thread
+
+
+def is_running(job_id: int):
+    with _running_lock:
+        return job_id in _running_jobs
+
+
+def _bound_arg(value: str):
+    try:
+        parse_created_bound(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"not an ISO date or datetime: {value}")
+    return value
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--type", dest="nomination_type", choices=[t.value for t in NominationTypeEnum])
+    parser.add_argument("--from", dest="created_from", type=_bound_arg, help="ISO date/datetime, inclusive")
+    parser.add_argument("--to", dest="created_to", type=_bound_arg, help="ISO date/datetime, inclusive (a date includes the whole day)")
+    parser.add_argument("--manager-id", type=int)
+    parser.add_argument("--stale", dest="stale_only", action="store_true",
+                        help="only nominations without a result for the current model version")
+    parser.add_argument("--resume", type=int, metavar="JOB_ID", help="resume an interrupted job")
+    parser.add_argument("--workers", type=int, default=settings.REANALYSIS_WORKERS)
+    parser.add_argument("--chunk-size", type=int, default=settings.REANALYSIS_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    if args.resume:
+        job_id = args.resume
+    else:
+        filters = {
+            key: value for key, value in {
+                "nomination_type": args.nomination_type,
+                "created_from": args.created_from,
+                "created_to": args.created_to,
+                "manager_id": args.manager_id,
+                "stale_only": args.stale_only or None,
+            }.items() if value is not None
+        }
+        db = SessionLocal()
+        try:
+            job_id = create_job(db, filters).id
+        finally:
+            db.close()
+        print(f"Created re-analysis job {job_id}")
+
+    def progress(job):
+        print(f"job {job.id}: {job.processed}/{job.total} re-scored (last nomination id {job.last_nomination_id})")
+
+    job = run_job(job_id, workers=args.workers, chunk_size=args.chunk_size, progress=progress)
+    print(f"Re-analysis job {job.id} done: {job.processed} nominations re-scored")
+
+
+if __name__ == "__main__":
+    main()
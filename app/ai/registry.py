@@ -0,0 +1,161 @@
+import gc
+import resource
+import threading
+import time
+from app.ai.metrics import model_loaded, model_load_seconds, model_resident_bytes
+
+
+def current_rss_bytes():
+    """
+    Resident set size of this process (falls back to peak RSS off Linux)
+    """
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024
+
+
+class _ModelEntry:
+    def __init__(self, name, loader):
+        self.name = name
+        self.loader = loader
+        self.model = None
+        self.lock = threading.Lock()
+        self.load_seconds = None
+        self.rss_bytes = None
+        self.loaded_at = None
+        self.last_used = None
+
+
+class ModelRegistry:
+    """
+    Loads models on first use (or on warmup) instead of at import time.
+
+    load_seconds and rss_bytes are measured around each load; rss_bytes is the
+    process RSS delta, so it is approximate when two models load at once.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._warmed_up = threading.Event()
+        self._reaper = None
+
+    def register(self, name: str, loader):
+        self._entries[name] = _ModelEntry(name, loader)
+
+    def get(self, name: str):
+        entry = self._entries[name]
+        entry.last_used = time.time()
+        model = entry.model
+        if model is not None:
+            return model
+
+        with entry.lock:
+            if entry.model is None:
+                rss_before = current_rss_bytes()
+                start = time.perf_counter()
+                entry.model = entry.loader()
+                entry.load_seconds = time.perf_counter() - start
+                entry.rss_bytes = max(0, current_rss_bytes() - rss_before)
+                entry.loaded_at = time.time()
+
+                model_loaded.labels(model=name).set(1)
+                model_load_seconds.labels(model=name).set(entry.load_seconds)
+                model_resident_bytes.labels(model=name).set(entry.rss_bytes)
+                print(f"Loaded model {name} in {entry.load_seconds:.1f}s (+{entry.rss_bytes / 2**20:.0f} MiB RSS)")
+            entry.last_used = time.time()
+            return entry.model
+
+    def warmup(self, names=None):
+        """
+        Load the given (default: all) models; marks the registry ready when done
+        """
+        for name in names or list(self._entries):
+            try:
+                self.get(name)
+            except Exception as e:
+                print(f"Error warming up model {name}:", e)
+                return False
+        self._warmed_up.set()
+        return True
+
+    def warmup_in_background(self, names=None, retry_seconds: float = 5, max_retry_seconds: float = 300):
+        """
+        warmup() in a thread, retried with exponential backoff until it succeeds
+        (e.g. after a temporary model download error)
+        """
+        def target():
+            delay = retry_seconds
+            while not self.warmup(names):
+                print(f"Retrying model warmup in {delay:.0f}s")
+                time.sleep(delay)
+                delay = min(delay * 2, max_retry_seconds)
+
+        thread = threading.Thread(target=target, name="model-warmup", daemon=True)
+        thread.start()
+        return thread
+
+    @property
+    def warmed_up(self):
+        # Models loaded lazily by get() after a failed warmup count as well
+        if not self._warmed_up.is_set() and self._entries and all(
+            entry.model is not None for entry in self._entries.values()
+        ):
+            self._warmed_up.set()
+        return self._warmed_up.is_set()
+
+    def unload(self, name: str):
+        entry = self._entries[name]
+        with entry.lock:
+            if entry.model is None:
+                return False
+            entry.model = None
+            entry.loaded_at = None
+        gc.collect()
+        model_loaded.labels(model=name).set(0)
+        model_resident_bytes.labels(model=name).set(0)
+        print(f"Unloaded idle model {name}")
+        return True
+
+    def unload_idle(self, max_idle_seconds: float):
+        now = time.time()
+        unloaded = []
+        for name, entry in self._entries.items():
+            if entry.model is not None and entry.last_used and now - entry.last_used > max_idle_seconds:
+                if self.unload(name):
+                    unloaded.append(name)
+        return unloaded
+
+    def start_idle_reaper(self, max_idle_seconds: float):
+        """
+        Background thread that unloads models unused for max_idle_seconds
+        """
+        if self._reaper is not None or max_idle_seconds <= 0:
+            return
+
+        def loop():
+            while True:
+                time.sleep(min(60, max_idle_seconds / 2))
+                self.unload_idle(max_idle_seconds)
+
+        self._reaper = threading.Thread(target=loop, name="model-reaper", daemon=True)
+        self._reaper.start()
+
+    def stats(self):
+        return [
+            {
+                "model": name,
+                "loaded": entry.model is not None,
+                "load_seconds": round(entry.load_seconds, 2) if entry.load_seconds is not None else None,
+                "rss_bytes": entry.rss_bytes if entry.model is not None else None,
+                "idle_seconds": round(time.time() - entry.last_used, 1) if entry.last_used else None,
+            }
+            for name, entry in self._entries.items()
+        ]
+
+
+model_registry = ModelRegistry()
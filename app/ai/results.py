@@ -0,0 +1,65 @@
+from datetime import datetime
+from sqlalchemy.orm import Session
+from app.models import SentimentResult, NominationTypeEnum
+
+# Columns of SentimentResult that come from analyze_nomination
+AI_RESULT_FIELDS = (
+    "sentiment_label", "sentiment_score", "predicted_core_value", "core_value_alignment", "model_version",
+)
+
+
+def nomination_type_value(nomination_type):
+    """
+    Enum -> string for SentimentResult
+    """
+    if isinstance(nomination_type, NominationTypeEnum):
+        return nomination_type.value
+    return str(nomination_type) if nomination_type is not None else None
+
+
+def build_ai_input(nomination, employee):
+    """
+    Shape a Nomination row into the dict expected by analyze_nomination
+    """
+    return {
+        "nomination_id": nomination.id,
+        "employee_id": employee.id,            # str
+        "manager_id": nomination.manager_id,
+        "core_value_claimed": nomination.core_value,
+        "comment": nomination.justification_text or "",
+    }
+
+
+def sentiment_result_values(nomination, employee, manager, ai_result: dict):
+    """
+    Column values for a SentimentResult row (safe defaults if fields missing)
+    """
+    ai_result = ai_result or {}
+    return {
+        "nomination_id": nomination.id,
+        "employee_id": employee.id,
+        "manager_id": manager.id,
+        "employee_name": employee.name,
+        "manager_name": manager.name,
+        "project_name": nomination.project_name,
+        "nomination_type": nomination_type_value(nomination.nomination_type),
+        **{field: ai_result.get(field) for field in AI_RESULT_FIELDS},
+        "analyzed_at": datetime.utcnow(),
+    }
+
+
+def upsert_sentiment_result(db: Session, nomination, employee, manager, ai_result: dict):
+    """
+    Upsert SentimentResult (PK = nomination_id). Caller commits.
+    """
+    values = sentiment_result_values(nomination, employee, manager, ai_result)
+
+    existing = db.query(SentimentResult).filter(SentimentResult.nomination_id == nomination.id).first()
+    if existing:
+        for column, value in values.items():
+            setattr(existing, column, value)
+        return existing
+
+    sr = SentimentResult(**values)
+    db.add(sr)
+    return sr
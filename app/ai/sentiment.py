@@ -1,13 +1,67 @@
+import hashlib
 import json
+import random
+import time
 from datetime import datetime
-from transformers import pipeline
+from app.config import settings
+from app.ai.backends import build_pipeline, backend_fingerprint
+from app.ai.batching import MicroBatcher
+from app.ai.core_values import CORE_VALUES, CORE_VALUE_DESCRIPTIONS, EmbeddingCoreValueClassifier
+from app.ai.cache import AnalysisResultCache, cache_key, normalize_core_value
+from app.ai.registry import model_registry
+from app.ai.executor import inference_executor
+from app.ai.metrics import InferenceStats, inference_stage_seconds, inference_pool_seconds
 
-# Load models once (cached in container)
-sentiment_model = pipeline("sentiment-analysis")
-core_value_model = pipeline("zero-shot-classification")
 
-# Sacumen core values
-CORE_VALUES = ["Customer delight", "Innovation", "Team work", "Being fair", "Ownership"]
+# Models are loaded on first use or by model_registry.warmup(), not at import time
+def _load_sentiment_model():
+    return build_pipeline("sentiment-analysis", settings.SENTIMENT_MODEL)
+
+
+def _load_core_value_model():
+    # Core value classifier: "nli" (zero-shot, one pass per label) or "embedding" (one encoder pass)
+    if settings.CORE_VALUE_CLASSIFIER == "embedding":
+        return EmbeddingCoreValueClassifier(
+            settings.CORE_VALUE_EMBEDDING_MODEL, batch_size=settings.INFERENCE_MAX_BATCH_SIZE
+        )
+    return build_pipeline("zero-shot-classification", settings.ZERO_SHOT_MODEL)
+
+
+def _load_lexicon_model():
+    from vaderSentiment.vaderSentiment import SentimentIntensityAnalyzer
+    return SentimentIntensityAnalyzer()
+
+
+model_registry.register("sentiment", _load_sentiment_model)
+model_registry.register("core_value", _load_core_value_model)
+if settings.SENTIMENT_MODE == "tiered":
+    model_registry.register("lexicon", _load_lexicon_model)
+
+
+def model_fingerprint():
+    """
+    Short hash of everything that changes analysis output: models, classifier mode and label set
+    """
+    spec = {
+        "backend": backend_fingerprint(),
+        "sentiment_model": settings.SENTIMENT_MODEL,
+        "core_value_classifier": settings.CORE_VALUE_CLASSIFIER,
+        "core_value_model": (
+            settings.CORE_VALUE_EMBEDDING_MODEL
+            if settings.CORE_VALUE_CLASSIFIER == "embedding"
+            else settings.ZERO_SHOT_MODEL
+        ),
+        "core_values": CORE_VALUES,
+    }
+    if settings.SENTIMENT_MODE == "tiered":
+        spec["sentiment_tiers"] = [settings.LEXICON_POSITIVE_THRESHOLD, settings.LEXICON_NEGATIVE_THRESHOLD]
+    if settings.CORE_VALUE_CLASSIFIER == "embedding":
+        spec["core_value_descriptions"] = [CORE_VALUE_DESCRIPTIONS.get(v, v) for v in CORE_VALUES]
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode("utf-8")).hexdigest()[:16]
+
+
+MODEL_VERSION = model_fingerprint()
+result_cache = AnalysisResultCache(max_entries=settings.INFERENCE_CACHE_SIZE)
 
 # ----------------------------
 # Step 1: Load nominations JSON
@@ -29,52 +83,261 @@ def preprocess_comment(comment: str):
     return comment.strip()
 
 # ----------------------------
-# Step 3: Analyze single nomination
+# Step 3: Batched model calls
 # ----------------------------
-def analyze_nomination(nomination: dict):
+def _lexicon_sentiment(comment: str):
     """
-    Runs sentiment analysis and core-value alignment
-    Input: {
-        "nomination_id": int,
-        "employee_id": int,
-        "manager_id": int,
-        "core_value_claimed": str,
-        "comment": str
-    }
-    Output: dict with sentiment & alignment results
+    VADER fast path: a sentiment dict for clearly polar comments, None when ambiguous
     """
-    comment = preprocess_comment(nomination["comment"])
-    
-    # Sentiment analysis
-    sentiment = sentiment_model(comment)[0]  # {'label': 'POSITIVE', 'score': 0.95}
-    
-    # Zero-shot classification for core value
-    core_value_pred = core_value_model(comment, CORE_VALUES)
-    predicted_value = core_value_pred["labels"][0]
-    
+    compound = model_registry.get("lexicon").polarity_scores(comment)["compound"]
+    if compound >= settings.LEXICON_POSITIVE_THRESHOLD:
+        label = "POSITIVE"
+    elif compound <= settings.LEXICON_NEGATIVE_THRESHOLD:
+        label = "NEGATIVE"
+    else:
+        return None
+    # Map |compound| in [threshold, 1] onto the transformer's 0.5-1 confidence scale
+    return {"label": label, "score": 0.5 + abs(compound) / 2}
+
+
+def _observe_inputs(model: str, tokenizer, comments: list, stats: InferenceStats):
+    """
+    Token counts for a sample of the comments sent to a model, and truncation
+    events. The pipeline tokenizes everything again, so only the sample and
+    the comments that could be truncated are tokenized here: a token covers at
+    least one UTF-8 byte, so a comment with no more bytes than token slots fits.
+    """
+    slots = tokenizer.model_max_length - tokenizer.num_special_tokens_to_add()
+    long = {i for i, c in enumerate(comments) if len(c.encode("utf-8")) > slots}
+    sample = set(random.sample(range(len(comments)), min(len(comments), settings.INFERENCE_TOKEN_SAMPLE_SIZE)))
+    indices = sorted(long | sample)
+    if not indices:
+        return
+    encoded = tokenizer([comments[i] for i in indices], verbose=False)["input_ids"]
+    lengths = {i: len(ids) for i, ids in zip(indices, encoded)}
+    for i in sample:
+        stats.observe("input_tokens", lengths[i], model=model)
+    truncated = sum(lengths[i] > tokenizer.model_max_length for i in long)
+    if truncated:
+        stats.inc("input_truncated_total", truncated, model=model)
+
+
+def score_sentiments(comments: list, stats: InferenceStats = None):
+    """
+    One sentiment forward pass for a list of comments
+    Output: [{'label': 'POSITIVE', 'score': 0.95}, ...]
+
+    In "tiered" mode the lexicon scorer answers clearly polar comments and
+    only the ambiguous rest go through the transformer. Metrics are collected
+    in stats when given (the caller records them), else recorded directly.
+    """
+    if not comments:
+        return []
+    stats = stats or InferenceStats(immediate=True)
+
+    results = [None] * len(comments)
+    if settings.SENTIMENT_MODE == "tiered":
+        results = [_lexicon_sentiment(c) for c in comments]
+        lexicon_hits = sum(r is not None for r in results)
+        if lexicon_hits:
+            stats.inc("sentiment_tier_total", lexicon_hits, tier="lexicon")
+
+    pending = [i for i, r in enumerate(results) if r is None]
+    if pending:
+        sentiment_model = model_registry.get("sentiment")
+        texts = [comments[i] for i in pending]
+        _observe_inputs("sentiment", sentiment_model.tokenizer, texts, stats)
+        stats.observe("inference_batch_size", len(texts), model="sentiment")
+        try:
+            with stats.time("inference_stage_seconds", stage="sentiment"):
+                scored = sentiment_model(texts, batch_size=settings.INFERENCE_MAX_BATCH_SIZE, truncation=True)
+        except Exception:
+            stats.inc("inference_errors_total", model="sentiment")
+            raise
+        for i, sentiment in zip(pending, scored):
+            results[i] = sentiment
+        stats.inc("sentiment_tier_total", len(pending), tier="transformer")
+
+    return results
+
+
+def predict_core_values(comments: list, stats: InferenceStats = None):
+    """
+    Zero-shot core value prediction for a list of comments
+    Output: top label per comment (metrics handled as in score_sentiments)
+    """
+    if not comments:
+        return []
+    stats = stats or InferenceStats(immediate=True)
+    core_value_model = model_registry.get("core_value")
+    _observe_inputs("core_value", core_value_model.tokenizer, comments, stats)
+    stats.observe("inference_batch_size", len(comments), model="core_value")
+    try:
+        with stats.time("inference_stage_seconds", stage="core_value"):
+            if isinstance(core_value_model, EmbeddingCoreValueClassifier):
+                return core_value_model.classify(comments)
+            preds = core_value_model(comments, CORE_VALUES, batch_size=settings.INFERENCE_MAX_BATCH_SIZE)
+    except Exception:
+        stats.inc("inference_errors_total", model="core_value")
+        raise
+    if isinstance(preds, dict):
+        preds = [preds]
+    return [p["labels"][0] for p in preds]
+
+
+def _collect_stats(fn, comments: list):
+    """
+    fn(comments) with its metrics collected as (results, stats); runs in a pool worker or in-process
+    """
+    stats = InferenceStats()
+    try:
+        return fn(comments, stats), stats
+    except Exception as e:
+        e.inference_stats = stats  # pickled along with the exception
+        raise
+
+
+def _run_model(model: str, fn, comments: list):
+    """
+    Run a batched model call in the inference process pool when it is up, else
+    in-process. Its metrics are recorded here, in the API process, either way.
+    """
+    try:
+        if inference_executor.running:
+            with inference_pool_seconds.labels(model=model).time():
+                results, stats = inference_executor.run(_collect_stats, fn, comments)
+        else:
+            results, stats = _collect_stats(fn, comments)
+    except Exception as e:
+        if getattr(e, "inference_stats", None) is not None:
+            e.inference_stats.record()
+        raise
+    stats.record()
+    return results
+
+
+def _run_sentiments(comments: list):
+    return _run_model("sentiment", score_sentiments, comments)
+
+
+def _run_core_values(comments: list):
+    return _run_model("core_value", predict_core_values, comments)
+
+
+# Concurrent analyses (e.g. the analysis queue's workers) share forward passes through these
+_sentiment_batcher = MicroBatcher(
+    _run_sentiments,
+    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+    name="sentiment-batcher",
+)
+_core_value_batcher = MicroBatcher(
+    _run_core_values,
+    max_batch_size=settings.INFERENCE_MAX_BATCH_SIZE,
+    max_wait_ms=settings.INFERENCE_MAX_WAIT_MS,
+    name="core-value-batcher",
+)
+
+
+def _score_comments(comments: list):
+    """
+    (sentiments, predicted core values) for a list of comments. With batching
+    on, both models run concurrently and the comments share batches with
+    other callers' comments.
+    """
+    if settings.INFERENCE_BATCHING_ENABLED:
+        sentiment_futures = _sentiment_batcher.submit_many(comments)
+        core_value_futures = _core_value_batcher.submit_many(comments)
+        return [f.result() for f in sentiment_futures], [f.result() for f in core_value_futures]
+    return _run_sentiments(comments), _run_core_values(comments)
+
+
+def _score_fields(nomination: dict, sentiment: dict, predicted_value: str):
     # Compute alignment score
-    match_score = 100 if predicted_value == nomination["core_value_claimed"] else 50
+    # Same normalization as the cache key, so entries shared by "Ownership " and "Ownership" agree
+    match_score = 100 if predicted_value == normalize_core_value(nomination["core_value_claimed"]) else 50
     if sentiment["label"] != "POSITIVE":
         match_score -= 20
-    
+
     return {
-        "nomination_id": nomination["nomination_id"],
-        "employee_id": nomination["employee_id"],
-        "manager_id": nomination["manager_id"],
         "sentiment_label": sentiment["label"],
         "sentiment_score": float(sentiment["score"]),
         "predicted_core_value": predicted_value,
         "core_value_alignment": match_score,
+    }
+
+
+def _build_result(nomination: dict, fields: dict):
+    return {
+        "nomination_id": nomination["nomination_id"],
+        "employee_id": nomination["employee_id"],
+        "manager_id": nomination["manager_id"],
+        **fields,
+        "model_version": MODEL_VERSION,
         "analyzed_at": datetime.now()
     }
 
+
+def _cache_key(nomination: dict, comment: str):
+    if not settings.INFERENCE_CACHE_ENABLED:
+        return None
+    return cache_key(comment, nomination["core_value_claimed"], MODEL_VERSION)
+
+# ----------------------------
+# Step 4: Analyze single nomination
+# ----------------------------
+def analyze_nomination(nomination: dict):
+    """
+    Runs sentiment analysis and core-value alignment
+    Input: {
+        "nomination_id": int,
+        "employee_id": int,
+        "manager_id": int,
+        "core_value_claimed": str,
+        "comment": str
+    }
+    Output: dict with sentiment & alignment results
+    """
+    return analyze_nominations([nomination])[0]
+
 # ----------------------------
-# Step 4: Analyze list of nominations
+# Step 5: Analyze list of nominations
 # ----------------------------
+def analyze_nominations(nominations: list):
+    """
+    Batched variant of analyze_nomination for callers that already hold a list.
+    Unchanged text + core value + model version skip inference entirely; the
+    rest go through the micro-batchers. Every nomination of the call counts
+    the call's duration as its "total" stage time.
+    """
+    started = time.perf_counter()
+    comments = [preprocess_comment(n["comment"]) for n in nominations]
+    keys = [_cache_key(n, c) for n, c in zip(nominations, comments)]
+
+    cached = result_cache.get_many([k for k in keys if k])
+    fields = [cached.get(k) if k else None for k in keys]
+    misses = [i for i, f in enumerate(fields) if f is None]
+
+    if misses:
+        miss_comments = [comments[i] for i in misses]
+        sentiments, predicted_values = _score_comments(miss_comments)
+        computed = {}
+        for i, sentiment, predicted_value in zip(misses, sentiments, predicted_values):
+            fields[i] = _score_fields(nominations[i], sentiment, predicted_value)
+            if keys[i]:
+                computed[keys[i]] = fields[i]
+        result_cache.put_many(MODEL_VERSION, computed)
+
+    elapsed = time.perf_counter() - started
+    total = inference_stage_seconds.labels(stage="total")
+    for _ in nominations:
+        total.observe(elapsed)
+    return [_build_result(n, f) for n, f in zip(nominations, fields)]
+
+
 def analyze_all_nominations(file_path="employee_nominations.json"):
     nominations = load_nominations(file_path)
-    results = [analyze_nomination(n) for n in nominations]
-    return results
+    return analyze_nominations(nominations)
 
 
-load_json = load_nominations
\ No newline at end of file
+load_json = load_nominations
@@ -0,0 +1,85 @@
+"""
+Offline sentiment scoring of Slack messages (SLACK_POSITIVE_MODE=model).
+
+Ingestion keeps the text of messages that pass the POSITIVE_KEYWORDS scan and
+counts them as positive provisionally. This job scores those candidates with
+the nomination sentiment model in large batches, stores the probability on
+the message (positive_score) so it is never scored again unless edited, and
+rebuilds the daily rollups of the affected days. Metrics refreshes never run
+the model.
+
+Usage (from the repo root):
+    python -m app.ai.slack_positivity
+    python -m app.ai.slack_positivity --limit 10000 --batch-size 512
+"""
+import argparse
+from datetime import timezone
+from app.config import settings
+from app.db import SessionLocal
+from app.models import SlackMessage
+from app.slack_metrics import rebuild_daily_rollups
+
+
+def positive_probability(sentiment: dict) -> float:
+    score = float(sentiment["score"])
+    return score if sentiment["label"].upper() == "POSITIVE" else 1.0 - score
+
+
+def score_pending_messages(db, batch_size: int = None, limit: int = None, progress=None) -> int:
+    """
+    Score keyword candidates without a positive_score, oldest first. Returns
+    the number of messages scored; each batch is committed with its rollups.
+    """
+    from app.ai.sentiment import score_sentiments
+
+    batch_size = batch_size or settings.SLACK_SCORING_BATCH_SIZE
+    scored = 0
+    while limit is None or scored < limit:
+        size = batch_size if limit is None else min(batch_size, limit - scored)
+        batch = (
+            db.query(SlackMessage)
+            .filter(SlackMessage.text.isnot(None), SlackMessage.positive_score.is_(None))
+            .order_by(SlackMessage.posted_at)
+            .limit(size)
+            .all()
+        )
+        if not batch:
+            break
+
+        days = set()
+        for message, sentiment in zip(batch, score_sentiments([m.text for m in batch])):
+            message.positive_score = positive_probability(sentiment)
+            message.is_positive = message.positive_score >= settings.SLACK_POSITIVE_THRESHOLD
+            days.add(message.posted_at.astimezone(timezone.utc).date())
+        db.flush()
+        rebuild_daily_rollups(db, days)
+        db.commit()
+
+        scored += len(batch)
+        if progress:
+            progress(scored)
+    return scored
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=settings.SLACK_SCORING_BATCH_SIZE)
+    parser.add_argument("--limit", type=int, help="stop after this many messages")
+    args = parser.parse_args()
+
+    if settings.SLACK_POSITIVE_MODE != "model":
+        parser.error("SLACK_POSITIVE_MODE is not 'model'; keyword matches are already final")
+
+    db = SessionLocal()
+    try:
+        total = score_pending_messages(
+            db, batch_size=args.batch_size, limit=args.limit,
+            progress=lambda n: print(f"{n} Slack messages scored"),
+        )
+    finally:
+        db.close()
+    print(f"Done: {total} Slack messages scored")
+
+
+if __name__ == "__main__":
+    main()
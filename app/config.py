@@ -10,7 +10,94 @@ class Settings(BaseSettings):
     JIRA_DOMAIN: str = "harshal782002.atlassian.net"
     PROJECT_KEY: str = "SCRUM"
 
+    # Jira search paging: issues per page and concurrent page requests
+    JIRA_PAGE_SIZE: int = 100
+    JIRA_FETCH_WORKERS: int = 8
+
+    # Incremental Jira sync into jira_issues: overlap added to the updated-since
+    # window, and how often to re-read the whole project (catches deleted issues)
+    JIRA_SYNC_OVERLAP_MINUTES: int = 2
+    JIRA_FULL_SYNC_HOURS: int = 24
+
+    # Concurrent /issue/{key}/worklog requests for issues whose inline worklogs are truncated,
+    # and how many earlier failed fetches each sync retries
+    JIRA_WORKLOG_WORKERS: int = 4
+    JIRA_WORKLOG_RETRY_LIMIT: int = 50
+
     SLACK_BOT_TOKEN: str | None = None
+    # Comma-separated channel ids to collect, fetched by SLACK_FETCH_WORKERS threads
+    SLACK_CHANNELS: str = "C09AJPQAYCT"
+    SLACK_FETCH_WORKERS: int = 4
+    # Slack messages are re-read this far behind the newest stored one to pick up new reactions/edits
+    SLACK_REACTION_LOOKBACK_HOURS: int = 24
+    # History read on a channel's first ingestion, and the window behind the per-user Slack gauges
+    SLACK_BACKFILL_DAYS: int = 90
+    SLACK_METRICS_WINDOW: str = "30d"
+    # Positive Slack messages: "keyword" (POSITIVE_KEYWORDS scan) or "model" (keyword matches
+    # re-checked offline by the sentiment model, python -m app.ai.slack_positivity)
+    SLACK_POSITIVE_MODE: str = "keyword"
+    SLACK_POSITIVE_THRESHOLD: float = 0.8
+    SLACK_SCORING_BATCH_SIZE: int = 256
+
+    # Outbound HTTP (Jira/Slack collectors): timeout, retries with exponential backoff
+    # (Retry-After wins on 429/503), per-host circuit breaker and connection pool size
+    HTTP_TIMEOUT_SECONDS: float = 10
+    HTTP_MAX_RETRIES: int = 3
+    HTTP_BACKOFF_SECONDS: float = 0.5
+    HTTP_BACKOFF_MAX_SECONDS: float = 30
+    HTTP_CIRCUIT_FAILURES: int = 5
+    HTTP_CIRCUIT_RESET_SECONDS: float = 60
+    HTTP_POOL_SIZE: int = 16
+
+    # Series per labelled collector gauge (Jira status/assignee, Slack per-user);
+    # the remaining label values are summed into "other"
+    METRICS_MAX_LABEL_VALUES: int = 50
+
+    # ---- Nomination analysis ----
+    SENTIMENT_MODEL: str = "distilbert/distilbert-base-uncased-finetuned-sst-2-english"
+    ZERO_SHOT_MODEL: str = "facebook/bart-large-mnli"
+
+    # Inference backend: "torch" or "onnx" (ONNX Runtime, dynamic int8 quantization)
+    INFERENCE_BACKEND: str = "torch"
+    ONNX_MODEL_DIR: str = "models/onnx"
+    ONNX_QUANTIZATION: str = "avx2"   # avx2, avx512, avx512_vnni, arm64 or none
+
+    # Dedicated inference processes (0 = run models in the API process), the torch
+    # intra-op thread count pinned in each of them and the limit per pool call
+    INFERENCE_PROCESSES: int = 0
+    INFERENCE_TORCH_THREADS: int = 1
+    INFERENCE_TIMEOUT_SECONDS: float = 120
+
+    # Model lifecycle: warm up in the background at startup (/readyz waits for it),
+    # unload models unused for MODEL_IDLE_UNLOAD_SECONDS (0 = never)
+    MODEL_WARMUP_ON_STARTUP: bool = True
+    MODEL_IDLE_UNLOAD_SECONDS: int = 0
+
+    # Bulk re-analysis (python -m app.ai.reanalysis / superadmin endpoint)
+    REANALYSIS_WORKERS: int = 2
+    REANALYSIS_CHUNK_SIZE: int = 256
+    ANALYSIS_WORKERS: int = 2
+
+    # Micro-batching of concurrent sentiment / zero-shot calls
+    INFERENCE_BATCHING_ENABLED: bool = True
+    INFERENCE_MAX_BATCH_SIZE: int = 16
+    INFERENCE_MAX_WAIT_MS: int = 10
+    # Comments per model call tokenized for the input token histogram (truncation is always counted)
+    INFERENCE_TOKEN_SAMPLE_SIZE: int = 4
+
+    # Sentiment: "transformer" (every comment) or "tiered" (VADER fast path, transformer for
+    # comments whose VADER compound score falls between the two thresholds)
+    SENTIMENT_MODE: str = "transformer"
+    LEXICON_POSITIVE_THRESHOLD: float = 0.6
+    LEXICON_NEGATIVE_THRESHOLD: float = -0.6
+
+    # Core value classifier: "nli" (zero-shot) or "embedding" (cosine similarity)
+    CORE_VALUE_CLASSIFIER: str = "nli"
+    CORE_VALUE_EMBEDDING_MODEL: str = "sentence-transformers/all-MiniLM-L6-v2"
+
+    # Content-addressed cache of analysis results (in-memory LRU + inference_cache table)
+    INFERENCE_CACHE_ENABLED: bool = True
+    INFERENCE_CACHE_SIZE: int = 10000
 
     model_config = SettingsConfigDict(env_file=".env", env_file_encoding="utf-8")
 
@@ -0,0 +1,197 @@
+"""
+Employee activity feature store (employee_metrics), keyed by Employee.id.
+
+Jira and Slack accounts are mapped to employees by email; matches are kept in
+employee_identities so later refreshes (and accounts whose email the API hides)
+resolve without another lookup. Each collector upserts only its own columns
+for the employees it saw, so a Jira refresh never touches Slack features and
+vice versa. load_feature_frame reads the whole table as one DataFrame in the
+shape app.ai.bias.detect_bias expects.
+"""
+import pandas as pd
+from sqlalchemy import func, case
+from sqlalchemy.dialects.postgresql import insert
+from app.models import Employee, EmployeeIdentity, EmployeeMetrics, Nomination, SentimentResult
+from app.ai.bias_stream import bias_tracker
+
+JIRA = "jira"
+SLACK = "slack"
+
+FEATURE_COLUMNS = [
+    "jira_tickets", "jira_hours",
+    "slack_activity", "slack_messages", "slack_reactions", "slack_mentions",
+    "slack_active_minutes", "slack_positive_messages",
+    "extra_activities", "customer_appreciations",
+    "nominations_received", "avg_sentiment_score",
+]
+
+
+# ----------------------------
+# Identity mapping
+# ----------------------------
+def resolve_identities(db, source: str, accounts: dict) -> dict:
+    """
+    accounts: external_id -> email (or None). Returns external_id -> employee_id
+    for every account that maps to an employee; new email matches are stored.
+    """
+    if not accounts:
+        return {}
+
+    resolved = {
+        i.external_id: i.employee_id
+        for i in db.query(EmployeeIdentity)
+        .filter(EmployeeIdentity.source == source, EmployeeIdentity.external_id.in_(list(accounts)))
+    }
+
+    by_email = {
+        email.strip().lower(): external_id
+        for external_id, email in accounts.items()
+        if external_id not in resolved and email
+    }
+    if by_email:
+        matches = db.query(Employee.id, func.lower(Employee.email)).filter(
+            func.lower(Employee.email).in_(list(by_email))
+        )
+        for employee_id, email in matches:
+            external_id = by_email[email]
+            resolved[external_id] = employee_id
+            db.add(EmployeeIdentity(source=source, external_id=external_id, employee_id=employee_id, email=email))
+
+    return resolved
+
+
+# ----------------------------
+# Writes
+# ----------------------------
+def upsert_features(db, features: dict):
+    """
+    features: employee_id -> {column: value}. One INSERT ... ON CONFLICT that
+    updates only the given columns; every row must carry the same columns.
+    """
+    if not features:
+        return
+    rows = [{"employee_id": employee_id, **values} for employee_id, values in features.items()]
+    stmt = insert(EmployeeMetrics).values(rows)
+    set_ = {column: stmt.excluded[column] for column in rows[0] if column != "employee_id"}
+    set_["updated_at"] = func.now()
+    stmt = stmt.on_conflict_do_update(index_elements=[EmployeeMetrics.employee_id], set_=set_)
+    db.execute(stmt)
+    _update_bias_tracker(db, features)
+
+
+def _update_bias_tracker(db, features: dict):
+    # Keep the in-memory bias statistics in step with the columns just written
+    tracked = [c for c in bias_tracker.features if c in next(iter(features.values()))]
+    if not tracked:
+        return
+    managers = dict(db.query(Employee.id, Employee.manager_id).filter(Employee.id.in_(list(features))))
+    for employee_id, values in features.items():
+        manager_id = managers.get(employee_id)
+        if manager_id is not None:
+            bias_tracker.update(str(employee_id), manager_id, {c: values[c] for c in tracked})
+
+
+def _sum_by_employee(resolved: dict, by_account: dict, columns: list) -> dict:
+    # Several accounts can map to one employee (e.g. a second Slack workspace user)
+    features = {}
+    for external_id, metrics in by_account.items():
+        employee_id = resolved.get(external_id)
+        if employee_id is None:
+            continue
+        row = features.setdefault(employee_id, {c: 0.0 for c in columns})
+        for c in columns:
+            row[c] += float(metrics.get(c) or 0)
+    return features
+
+
+def update_jira_features(db, by_account: dict, emails: dict):
+    """
+    by_account: Jira accountId -> {"jira_tickets", "jira_hours"}
+    """
+    resolved = resolve_identities(db, JIRA, emails)
+    upsert_features(db, _sum_by_employee(resolved, by_account, ["jira_tickets", "jira_hours"]))
+
+
+def update_slack_features(db, by_user: dict, emails: dict):
+    """
+    by_user: Slack user id -> collect_user_activity() metrics
+    """
+    renamed = {
+        user_id: {
+            "slack_messages": m.get("messages"),
+            "slack_reactions": m.get("reactions"),
+            "slack_mentions": m.get("mentions"),
+            "slack_active_minutes": m.get("active_minutes"),
+            "slack_positive_messages": m.get("positive_msgs"),
+        }
+        for user_id, m in by_user.items()
+    }
+    resolved = resolve_identities(db, SLACK, emails)
+    features = _sum_by_employee(resolved, renamed, [
+        "slack_messages", "slack_reactions", "slack_mentions", "slack_active_minutes", "slack_positive_messages",
+    ])
+    for row in features.values():
+        # Single engagement signal used by bias detection
+        row["slack_activity"] = row["slack_messages"] + row["slack_reactions"] + row["slack_mentions"]
+    upsert_features(db, features)
+
+
+def refresh_nomination_features(db, employee_ids=None):
+    """
+    Recompute nomination counts, customer appreciations (nominations with a
+    customer email) and average sentiment, for the given employees or everyone.
+    """
+    query = (
+        db.query(
+            Nomination.nominee_id.label("employee_id"),
+            func.count(Nomination.id).label("nominations_received"),
+            func.sum(case((func.coalesce(Nomination.customer_email, "") != "", 1), else_=0))
+            .label("customer_appreciations"),
+            func.avg(SentimentResult.sentiment_score).label("avg_sentiment_score"),
+        )
+        .outerjoin(SentimentResult, SentimentResult.nomination_id == Nomination.id)
+        .filter(Nomination.nominee_id.isnot(None))
+        .group_by(Nomination.nominee_id)
+    )
+    if employee_ids is not None:
+        employee_ids = list(set(employee_ids))
+        if not employee_ids:
+            return
+        query = query.filter(Nomination.nominee_id.in_(employee_ids))
+
+    upsert_features(db, {
+        r.employee_id: {
+            "nominations_received": float(r.nominations_received),
+            "customer_appreciations": float(r.customer_appreciations or 0),
+            "avg_sentiment_score": float(r.avg_sentiment_score) if r.avg_sentiment_score is not None else None,
+        }
+        for r in query
+    })
+
+
+# ----------------------------
+# Reads
+# ----------------------------
+def load_feature_frame(db, manager_id: int = None, columns=None) -> pd.DataFrame:
+    """
+    Employee features as one DataFrame: ['employee_id', 'manager_id', *columns].
+    Employees without a metrics row get zeros (avg_sentiment_score stays NaN);
+    employees without a manager are left out. This is the population all
+    three bias modes use (detect_bias, the streaming tracker, detect_bias_sql).
+    """
+    columns = list(columns or FEATURE_COLUMNS)
+    selected = [
+        getattr(EmployeeMetrics, c) if c == "avg_sentiment_score"
+        else func.coalesce(getattr(EmployeeMetrics, c), 0).label(c)
+        for c in columns
+    ]
+    query = (
+        db.query(Employee.id.label("employee_id"), Employee.manager_id.label("manager_id"), *selected)
+        .outerjoin(EmployeeMetrics, EmployeeMetrics.employee_id == Employee.id)
+        .filter(Employee.manager_id.isnot(None))
+        .order_by(Employee.id)
+    )
+    if manager_id is not None:
+        query = query.filter(Employee.manager_id == manager_id)
+
+    return pd.read_sql(query.statement, db.connection())
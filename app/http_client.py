@@ -0,0 +1,215 @@
+"""
+Shared HTTP client for the Jira and Slack collectors.
+
+One pooled requests.Session per host (keep-alive, connection reuse across
+the collector threads), a default timeout, retries with exponential backoff
+that honour Retry-After on 429/503, and a per-host circuit breaker: after
+HTTP_CIRCUIT_FAILURES consecutive failed calls the host is skipped for
+HTTP_CIRCUIT_RESET_SECONDS, then a single trial call decides whether it
+closes again.
+"""
+import random
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from urllib.parse import urlsplit
+import requests
+from requests.adapters import HTTPAdapter
+from prometheus_client import Counter, Gauge
+from app.config import settings
+
+# ---- Prometheus metrics ----
+http_client_requests = Counter(
+    "http_client_requests_total", "Outbound collector HTTP requests by host and outcome", ["host", "outcome"]
+)
+http_client_retries = Counter(
+    "http_client_retries_total", "Outbound HTTP retries by host and reason", ["host", "reason"]
+)
+http_client_connections = Gauge(
+    "http_client_connections_opened", "Connections opened by the pooled session of each host", ["host"]
+)
+http_client_circuit_open = Gauge(
+    "http_client_circuit_open", "1 while the circuit breaker of a host is open", ["host"]
+)
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of calling a host whose circuit breaker is open"""
+
+
+class CircuitBreaker:
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self):
+        return self._opened_at is not None
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if time.monotonic() - self._opened_at < self.reset_seconds or self._trial_running:
+                return False
+            # Half-open: let one call through
+            self._trial_running = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            self._trial_running = False
+            if self._opened_at is not None or self._failures >= self.failure_threshold:
+                self._opened_at = time.monotonic()
+
+
+def _retry_after_seconds(response):
+    value = response.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class HttpClient:
+    def __init__(self, timeout: float, max_retries: int, backoff_seconds: float, backoff_max_seconds: float,
+                 circuit_failures: int, circuit_reset_seconds: float, pool_size: int):
+        self.timeout = timeout
+        self.max_retries = max(0, max_retries)
+        self.backoff_seconds = backoff_seconds
+        self.backoff_max_seconds = backoff_max_seconds
+        self.circuit_failures = circuit_failures
+        self.circuit_reset_seconds = circuit_reset_seconds
+        self.pool_size = max(1, pool_size)
+        self._sessions = {}   # host -> requests.Session
+        self._breakers = {}   # host -> CircuitBreaker
+        self._lock = threading.Lock()
+
+    def _host_state(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session = requests.Session()
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._sessions[host] = session
+                self._breakers[host] = CircuitBreaker(self.circuit_failures, self.circuit_reset_seconds)
+                http_client_connections.labels(host=host).set_function(lambda: _connections_opened(adapter))
+            return session, self._breakers[host]
+
+    def _backoff_delay(self, attempt, response=None):
+        delay = _retry_after_seconds(response) if response is not None else None
+        if delay is None:
+            delay = min(self.backoff_max_seconds, self.backoff_seconds * 2 ** attempt)
+            delay *= random.uniform(0.5, 1.0)
+        return min(delay, self.backoff_max_seconds)
+
+    def request(self, method, url, on_rate_limited=None, **kwargs) -> requests.Response:
+        """
+        Send a request with retries. 4xx responses (other than 429) are
+        returned as-is; callers still call raise_for_status() as before.
+        Raises CircuitOpenError while the host's breaker is open.
+
+        on_rate_limited(delay) is called before sleeping on a 429, e.g. to
+        pause a shared rate limiter for the same delay.
+        """
+        host = urlsplit(url).netloc
+        session, breaker = self._host_state(host)
+        if not breaker.allow():
+            http_client_requests.labels(host=host, outcome="circuit_open").inc()
+            raise CircuitOpenError(f"Circuit open for {host}; skipping request")
+
+        kwargs.setdefault("timeout", self.timeout)
+        for attempt in range(self.max_retries + 1):
+            last_attempt = attempt == self.max_retries
+            try:
+                response = session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                http_client_requests.labels(host=host, outcome="error").inc()
+                if last_attempt:
+                    self._record_failure(host, breaker)
+                    raise
+                http_client_retries.labels(host=host, reason=type(e).__name__).inc()
+                time.sleep(self._backoff_delay(attempt))
+                continue
+            except requests.RequestException:
+                http_client_requests.labels(host=host, outcome="error").inc()
+                self._record_failure(host, breaker)
+                raise
+
+            http_client_requests.labels(host=host, outcome=str(response.status_code)).inc()
+            if response.status_code not in RETRY_STATUSES:
+                self._record_success(host, breaker)
+                return response
+            if last_attempt:
+                # Rate limiting means the host is up; only server errors count against it
+                if response.status_code == 429:
+                    self._record_success(host, breaker)
+                else:
+                    self._record_failure(host, breaker)
+                return response
+            http_client_retries.labels(host=host, reason=str(response.status_code)).inc()
+            delay = self._backoff_delay(attempt, response)
+            if response.status_code == 429 and on_rate_limited is not None:
+                on_rate_limited(delay)
+            time.sleep(delay)
+
+    def get(self, url, on_rate_limited=None, **kwargs) -> requests.Response:
+        return self.request("GET", url, on_rate_limited=on_rate_limited, **kwargs)
+
+    def _record_success(self, host, breaker):
+        breaker.record_success()
+        http_client_circuit_open.labels(host=host).set(0)
+
+    def _record_failure(self, host, breaker):
+        breaker.record_failure()
+        http_client_circuit_open.labels(host=host).set(1 if breaker.is_open else 0)
+
+    def close(self):
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._breakers.clear()
+
+
+def _connections_opened(adapter):
+    pools = adapter.poolmanager.pools
+    total = 0
+    for key in list(pools.keys()):
+        pool = pools.get(key)
+        if pool is not None:
+            total += pool.num_connections
+    return total
+
+
+http_client = HttpClient(
+    timeout=settings.HTTP_TIMEOUT_SECONDS,
+    max_retries=settings.HTTP_MAX_RETRIES,
+    backoff_seconds=settings.HTTP_BACKOFF_SECONDS,
+    backoff_max_seconds=settings.HTTP_BACKOFF_MAX_SECONDS,
+    circuit_failures=settings.HTTP_CIRCUIT_FAILURES,
+    circuit_reset_seconds=settings.HTTP_CIRCUIT_RESET_SECONDS,
+    pool_size=settings.HTTP_POOL_SIZE,
+)
@@ -1,14 +1,26 @@
+import math
 import os
-import requests
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from prometheus_client import Gauge
+from sqlalchemy import case, func
+from sqlalchemy.dialects.postgresql import insert
+from app import feature_store
+from app.config import settings
+from app.db import SessionLocal
+from app.http_client import http_client
+from app.prometheus_snapshot import SnapshotGauge
+from app.models import JiraIssue, SyncState
 
 # ---- JIRA Prometheus metrics ----
 jira_tickets_completed = Gauge("jira_tickets_completed_total", "Total number of completed tickets")
 jira_hours_logged = Gauge("jira_hours_logged_total", "Total hours logged in Jira")
 jira_avg_hours_per_ticket = Gauge("jira_avg_hours_per_ticket", "Average hours logged per ticket")
 jira_open_tickets = Gauge("jira_open_tickets_total", "Total number of open tickets")
-jira_tickets_by_status = Gauge("jira_tickets_by_status", "Number of Jira tickets by status", ["status"])
-jira_tickets_by_assignee = Gauge("jira_tickets_by_assignee", "Number of Jira tickets per assignee", ["assignee"])
+jira_tickets_by_status = SnapshotGauge("jira_tickets_by_status", "Number of Jira tickets by status", ["status"])
+jira_tickets_by_assignee = SnapshotGauge("jira_tickets_by_assignee", "Number of Jira tickets per assignee", ["assignee"])
 
 
 # ---- Jira config from environment variables ----
@@ -19,60 +31,315 @@ PROJECT_KEY = os.getenv("PROJECT_KEY", "SCRUM")
 
 
 
-JIRA_SEARCH_URL = f"https://{JIRA_DOMAIN}/rest/api/3/search?jql=project={PROJECT_KEY}&fields=status,worklog"
+JIRA_SEARCH_URL = f"https://{JIRA_DOMAIN}/rest/api/3/search"
+JIRA_WORKLOG_URL = f"https://{JIRA_DOMAIN}/rest/api/3/issue/{{key}}/worklog"
+JIRA_FIELDS = "status,worklog,assignee"
 
 
 
 print("Jira email:", JIRA_EMAIL)
 print("Jira token set?", bool(JIRA_API_TOKEN))
 
-def fetch_jira_data():
-    if not JIRA_EMAIL or not JIRA_API_TOKEN:
-        print("Jira credentials not set!")
-        return
+def _get_json(url, params):
+    response = http_client.get(
+        url, params=params, headers={"Accept": "application/json"}, auth=(JIRA_EMAIL, JIRA_API_TOKEN),
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+def _search_page(jql, fields, start_at, page_size):
+    return _get_json(JIRA_SEARCH_URL, {"jql": jql, "fields": fields, "startAt": start_at, "maxResults": page_size})
+
+
+def fetch_worklog_seconds(key):
+    """
+    Total time logged on one issue, paging through /issue/{key}/worklog
+    """
+    url = JIRA_WORKLOG_URL.format(key=key)
+    seconds = 0
+    start_at = 0
+    while True:
+        page = _get_json(url, {"startAt": start_at, "maxResults": 1000})
+        worklogs = page.get("worklogs", [])
+        seconds += sum(w.get("timeSpentSeconds", 0) for w in worklogs)
+        start_at += len(worklogs)
+        if not worklogs or start_at >= page.get("total", 0):
+            return seconds
+
+
+def iter_jira_issues(jql=None, fields=JIRA_FIELDS, page_size=None, workers=None, on_total=None):
+    """
+    Yield every issue matching jql, in search order.
+
+    The first page is read on its own to learn the total (passed to
+    on_total, if given); the remaining startAt offsets are then fetched
+    through a pool of `workers` threads with at most 2 x workers pages in
+    flight, so memory stays bounded however many issues the project has.
+    Offsets shift while issues change, so an issue can be returned twice or
+    not at all.
+    """
+    jql = jql or f"project={PROJECT_KEY} ORDER BY key"
+    page_size = page_size or settings.JIRA_PAGE_SIZE
+    workers = max(1, workers or settings.JIRA_FETCH_WORKERS)
 
-    auth = (JIRA_EMAIL, JIRA_API_TOKEN)
-    headers = {"Accept": "application/json"}
+    first = _search_page(jql, fields, 0, page_size)
+    yield from first.get("issues", [])
 
+    total = first.get("total", 0)
+    if on_total is not None:
+        on_total(total)
+    # Jira may cap maxResults below what was asked for; page by what it actually returned
+    page_size = first.get("maxResults") or page_size
+    offsets = iter(range(page_size, total, page_size))
+
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="jira-search") as pool:
+        in_flight = deque()
+        for start_at in offsets:
+            in_flight.append(pool.submit(_search_page, jql, fields, start_at, page_size))
+            if len(in_flight) >= 2 * workers:
+                break
+        while in_flight:
+            page = in_flight.popleft().result()
+            next_start = next(offsets, None)
+            if next_start is not None:
+                in_flight.append(pool.submit(_search_page, jql, fields, next_start, page_size))
+            yield from page.get("issues", [])
+
+
+# ---- Incremental sync into the local jira_issues table ----
+SYNC_NAME = "jira"
+_sync_lock = threading.Lock()
+
+
+def _parse_jira_time(value):
+    if not value:
+        return None
     try:
-        response = requests.get(JIRA_SEARCH_URL, headers=headers, auth=auth, timeout=10)
-        response.raise_for_status()
-        data = response.json()
+        return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S.%f%z")
+    except ValueError:
+        return None
+
+
+def _issue_row(issue, synced_at):
+    fields = issue["fields"]
+    assignee = fields.get("assignee") or {}
+    worklogs = (fields.get("worklog") or {}).get("worklogs", [])
+    return {
+        "key": issue["key"],
+        "status": fields["status"]["name"],
+        "assignee_account_id": assignee.get("accountId"),
+        "assignee_name": assignee.get("displayName"),
+        "assignee_email": assignee.get("emailAddress"),
+        "worklog_seconds": sum(w.get("timeSpentSeconds", 0) for w in worklogs),
+        "updated": _parse_jira_time(fields.get("updated")),
+        "worklog_complete": True,
+        "synced_at": synced_at,
+    }
+
+
+def _worklog_truncated(issue):
+    # Search results embed only the first page of worklogs
+    worklog = issue["fields"].get("worklog") or {}
+    return worklog.get("total", 0) > len(worklog.get("worklogs", []))
+
+
+def _complete_worklogs(db, issues, rows, pool):
+    """
+    Replace the inline worklog sum of truncated issues with the full total.
+    The stored total is reused while the issue's updated time is unchanged
+    (logging work bumps it); otherwise the worklogs are fetched through pool.
+    """
+    truncated = {issue["key"]: row for issue, row in zip(issues, rows) if _worklog_truncated(issue)}
+    if not truncated:
+        return
+
+    cached = dict(
+        db.query(JiraIssue.key, JiraIssue.updated)
+        .filter(JiraIssue.key.in_(list(truncated)), JiraIssue.worklog_complete.is_(True))
+        .all()
+    )
+    futures = {}
+    for key, row in truncated.items():
+        if row["updated"] is not None and cached.get(key) == row["updated"]:
+            # Leave worklog_seconds out of the update; the stored value is complete
+            row.pop("worklog_seconds")
+        else:
+            futures[key] = pool.submit(fetch_worklog_seconds, key)
+
+    for key, future in futures.items():
+        try:
+            truncated[key]["worklog_seconds"] = future.result()
+        except Exception as e:
+            print(f"Error fetching worklogs for {key}:", e)
+            truncated[key]["worklog_complete"] = False
+
+
+def _retry_incomplete_worklogs(db, pool):
+    # Issues whose worklog fetch failed earlier and that have not changed since; at most
+    # JIRA_WORKLOG_RETRY_LIMIT per run, picked at random so persistent failures cannot starve the rest
+    keys = [
+        key for (key,) in db.query(JiraIssue.key)
+        .filter(JiraIssue.worklog_complete.is_(False))
+        .order_by(func.random())
+        .limit(settings.JIRA_WORKLOG_RETRY_LIMIT)
+    ]
+    futures = {key: pool.submit(fetch_worklog_seconds, key) for key in keys}
+    for key, future in futures.items():
+        try:
+            seconds = future.result()
+        except Exception as e:
+            print(f"Error fetching worklogs for {key}:", e)
+            continue
+        db.query(JiraIssue).filter(JiraIssue.key == key).update(
+            {"worklog_seconds": seconds, "worklog_complete": True}, synchronize_session=False
+        )
+
+
+def _upsert_issues(db, rows):
+    # Rows whose cached worklog total is kept omit worklog_seconds, so they go in a separate statement
+    groups = {}
+    for row in rows:
+        groups.setdefault(tuple(row), []).append(row)
+    for columns, group in groups.items():
+        stmt = insert(JiraIssue).values(group)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[JiraIssue.key],
+            set_={column: stmt.excluded[column] for column in columns if column != "key"},
+        )
+        db.execute(stmt)
+
+
+def _store_issues(db, issues, synced_at, pool):
+    # One row per key: ON CONFLICT DO UPDATE cannot touch the same row twice in one statement
+    issues = list({issue["key"]: issue for issue in issues}.values())
+    rows = [_issue_row(issue, synced_at) for issue in issues]
+    _complete_worklogs(db, issues, rows, pool)
+    _upsert_issues(db, rows)
+
+
+def sync_jira_issues(db, full: bool = None) -> int:
+    """
+    Bring jira_issues up to date and return the number of distinct issues fetched.
 
-        completed = 0
-        total_hours = 0.0
-        status_counts = {}
-        assignee_counts = {}
+    Incremental runs ask Jira only for issues updated since the last
+    watermark (relative JQL, so the Jira user's time zone does not matter,
+    plus JIRA_SYNC_OVERLAP_MINUTES of slack). A full run, done on first use
+    and every JIRA_FULL_SYNC_HOURS, re-reads the project and drops issues
+    that were deleted or moved out of it.
+    """
+    started = datetime.now(timezone.utc)
+    state = db.get(SyncState, SYNC_NAME)
+    if state is None:
+        state = SyncState(name=SYNC_NAME)
+        db.add(state)
 
-        issues = data.get("issues", [])
+    if full is None:
+        full = (
+            state.watermark is None
+            or state.last_full_sync is None
+            or started - state.last_full_sync > timedelta(hours=settings.JIRA_FULL_SYNC_HOURS)
+        )
+
+    jql = f"project={PROJECT_KEY}"
+    if not full:
+        minutes = math.ceil((started - state.watermark).total_seconds() / 60) + settings.JIRA_SYNC_OVERLAP_MINUTES
+        jql += f' AND updated >= "-{minutes}m"'
+    jql += " ORDER BY key"
+
+    batch = []
+    seen = set()
+    totals = {}
+    with ThreadPoolExecutor(max_workers=max(1, settings.JIRA_WORKLOG_WORKERS), thread_name_prefix="jira-worklog") as pool:
+        issues = iter_jira_issues(jql, fields=JIRA_FIELDS + ",updated", on_total=lambda n: totals.update(total=n))
         for issue in issues:
-            fields = issue["fields"]
-            status = fields["status"]["name"]
-            status_counts[status] = status_counts.get(status, 0) + 1
+            seen.add(issue["key"])
+            batch.append(issue)
+            if len(batch) >= settings.JIRA_PAGE_SIZE:
+                _store_issues(db, batch, started, pool)
+                batch = []
+        if batch:
+            _store_issues(db, batch, started, pool)
+        _retry_incomplete_worklogs(db, pool)
+
+    if full:
+        if len(seen) >= totals.get("total", 0):
+            # Every issue still in the project was stamped with this run's time
+            db.query(JiraIssue).filter(JiraIssue.synced_at < started).delete(synchronize_session=False)
+        else:
+            # Paging skipped issues that changed meanwhile; unstamped rows may still exist in Jira.
+            # Deleted issues are dropped by the next full sync instead
+            print(f"Full Jira sync saw {len(seen)} of {totals['total']} issues; not dropping unseen issues")
+        state.last_full_sync = started
+    state.watermark = started
+    db.commit()
+    return len(seen)
 
-            assignee = fields.get("assignee", {}).get("displayName", "Unassigned")
-            assignee_counts[assignee] = assignee_counts.get(assignee, 0) + 1
 
-            if status.lower() == "done":
-                completed += 1
+def update_jira_metrics(db):
+    """
+    Set the Jira gauges and employee features from aggregate queries over jira_issues
+    """
+    done = func.lower(JiraIssue.status) == "done"
+    issue_count, completed, worklog_seconds, open_count = db.query(
+        func.count(JiraIssue.key),
+        func.coalesce(func.sum(case((done, 1), else_=0)), 0),
+        func.coalesce(func.sum(JiraIssue.worklog_seconds), 0),
+        func.coalesce(func.sum(case((JiraIssue.status.in_(["To Do", "In Progress"]), 1), else_=0)), 0),
+    ).one()
 
-            worklogs = fields.get("worklog", {}).get("worklogs", [])
-            ticket_hours = sum([w.get("timeSpentSeconds", 0) / 3600 for w in worklogs])
-            total_hours += ticket_hours
+    total_hours = worklog_seconds / 3600
+    jira_tickets_completed.set(completed)
+    jira_hours_logged.set(total_hours)
+    jira_avg_hours_per_ticket.set(total_hours / issue_count if issue_count else 0)
+    jira_open_tickets.set(open_count)
 
-        # Update Prometheus metrics
-        jira_tickets_completed.set(completed)
-        jira_hours_logged.set(total_hours)
-        jira_avg_hours_per_ticket.set(total_hours / len(issues) if issues else 0)
-        jira_open_tickets.set(status_counts.get("To Do", 0) + status_counts.get("In Progress", 0))
+    jira_tickets_by_status.replace(dict(
+        db.query(JiraIssue.status, func.count(JiraIssue.key)).group_by(JiraIssue.status).all()
+    ))
 
-        for s, count in status_counts.items():
-            jira_tickets_by_status.labels(status=s).set(count)
-        for a, count in assignee_counts.items():
-            jira_tickets_by_assignee.labels(assignee=a).set(count)
+    assignee = func.coalesce(JiraIssue.assignee_name, "Unassigned")
+    jira_tickets_by_assignee.replace(dict(db.query(assignee, func.count(JiraIssue.key)).group_by(assignee).all()))
 
+    per_account = (
+        db.query(
+            JiraIssue.assignee_account_id,
+            func.max(JiraIssue.assignee_email).label("email"),
+            func.sum(case((done, 1), else_=0)).label("jira_tickets"),
+            (func.sum(JiraIssue.worklog_seconds) / 3600.0).label("jira_hours"),
+        )
+        .filter(JiraIssue.assignee_account_id.isnot(None))
+        .group_by(JiraIssue.assignee_account_id)
+        .all()
+    )
+    feature_store.update_jira_features(
+        db,
+        {r.assignee_account_id: {"jira_tickets": r.jira_tickets, "jira_hours": r.jira_hours} for r in per_account},
+        {r.assignee_account_id: r.email for r in per_account},
+    )
+    db.commit()
+
+
+def fetch_jira_data():
+    if not JIRA_EMAIL or not JIRA_API_TOKEN:
+        print("Jira credentials not set!")
+        return
+
+    db = SessionLocal()
+    try:
+        # A sync already running (loop vs. /metrics scrape) is not repeated; the gauges
+        # are then computed from what is cached
+        if _sync_lock.acquire(blocking=False):
+            try:
+                sync_jira_issues(db)
+            finally:
+                _sync_lock.release()
+        update_jira_metrics(db)
     except Exception as e:
+        db.rollback()
         print("Error fetching Jira data:", e)
+    finally:
+        db.close()
 
 
 
@@ -1,4 +1,5 @@
 from fastapi import FastAPI
+from fastapi.responses import JSONResponse
 from app import auth  # import auth.py
 from app.routes import ai_routes, nomination_routes
 from app.db import engine, Base
@@ -7,8 +8,16 @@ from app.db_seed import seed_superadmin
 from app.seed_emp import seed_employees
 from fastapi.middleware.cors import CORSMiddleware
 from app.routes import project_routes, employee_routes, manager_routes, nomination_routes, report_routes, prometheus_routes
-from app.routes import ai_routes
+from app.routes import ai_routes, bias_routes, slack_routes
 from app.jira_metrics import start_metrics_loop
+from app.ai.analysis_queue import analysis_queue
+from app.ai.registry import model_registry
+from app.ai.executor import inference_executor
+from app.http_client import http_client
+from app.db import SessionLocal
+from app.feature_store import load_feature_frame
+from app.ai.bias_stream import bias_tracker
+from app.config import settings
 
 
 app = FastAPI(title="Auth Service", redirect_slashes=True)
@@ -34,6 +43,8 @@ app.include_router(nomination_routes.router)
 app.include_router(report_routes.router)
 app.include_router(report_routes.dashboard_router)
 app.include_router(prometheus_routes.router)
+app.include_router(bias_routes.router)
+app.include_router(slack_routes.router)
 
 
 
@@ -41,12 +52,66 @@ app.include_router(prometheus_routes.router)
 def health_check():
     return {"status": "ok"}
 
+@app.get("/readyz")
+def readiness_check():
+    # Ready once models are warm (warmup retries with backoff, and lazily loaded models count too);
+    # pods without warmup load models lazily and are ready at once
+    ready = model_registry.warmed_up or not settings.MODEL_WARMUP_ON_STARTUP
+    content = {"models": model_registry.stats()}
+    if inference_executor.enabled:
+        # Not ready while the pool starts, or restarts after a worker died
+        ready = inference_executor.ready
+        content["inference_pool"] = {"ready": ready, "restarts": inference_executor.restarts}
+    return JSONResponse(
+        status_code=200 if ready else 503,
+        content={"status": "ready" if ready else "warming_up", **content},
+    )
+
+def seed_bias_tracker():
+    # Start the streaming bias statistics from the stored features; upsert_features keeps them current
+    db = SessionLocal()
+    try:
+        bias_tracker.seed(load_feature_frame(db, columns=bias_tracker.features))
+    except Exception as e:
+        print("Error seeding bias tracker:", e)
+    finally:
+        db.close()
+
+
+def recover_analysis_queue():
+    # Queued analyses are lost on restart; re-queue nominations without an up-to-date result
+    db = SessionLocal()
+    try:
+        queued = analysis_queue.recover(db)
+        if queued:
+            print(f"Re-queued {queued} nominations for analysis")
+    except Exception as e:
+        print("Error re-queuing nominations for analysis:", e)
+    finally:
+        db.close()
+
+
 @app.on_event("startup")
 def startup_event():
     seed_superadmin()
     seed_employees()
+    seed_bias_tracker()
+    recover_analysis_queue()
+
+    # Load nomination models without blocking startup; /readyz flips once done
+    if inference_executor.enabled:
+        inference_executor.start_in_background()
+    elif settings.MODEL_WARMUP_ON_STARTUP:
+        model_registry.warmup_in_background()
+    model_registry.start_idle_reaper(settings.MODEL_IDLE_UNLOAD_SECONDS)
 
      # Start Jira metrics collection in the background
     start_metrics_loop(interval_seconds=30, port=2112)
 
 
+@app.on_event("shutdown")
+def shutdown_event():
+    # Let queued nomination analyses finish before the worker exits
+    analysis_queue.shutdown(wait=True)
+    inference_executor.shutdown()
+    http_client.close()
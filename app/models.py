@@ -1,5 +1,7 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Float, DateTime
+from sqlalchemy import Column, Integer, String, ForeignKey, Text, Boolean, Float, DateTime, Date, Index
+from sqlalchemy.dialects.postgresql import ARRAY
 from sqlalchemy.sql import func
+from sqlalchemy.sql import text as sql_text
 from sqlalchemy.orm import relationship
 from sqlalchemy import Enum as SQLEnum
 from .db import Base
@@ -44,6 +46,45 @@ class Employee(Base):
     nominations = relationship("Nomination", backref="employee")
 
 
+class EmployeeMetrics(Base):
+    __tablename__ = "employee_metrics"
+
+    # One row of activity features per employee (bias detection / best-employee scoring).
+    # Refreshed per source by app/feature_store.py
+    employee_id = Column(String(20), ForeignKey("employees.id"), primary_key=True)
+    jira_tickets = Column(Float, nullable=False, default=0, server_default="0")
+    slack_activity = Column(Float, nullable=False, default=0, server_default="0")
+    extra_activities = Column(Float, nullable=False, default=0, server_default="0")
+    customer_appreciations = Column(Float, nullable=False, default=0, server_default="0")
+
+    # Jira
+    jira_hours = Column(Float, nullable=False, default=0, server_default="0")
+
+    # Slack
+    slack_messages = Column(Float, nullable=False, default=0, server_default="0")
+    slack_reactions = Column(Float, nullable=False, default=0, server_default="0")
+    slack_mentions = Column(Float, nullable=False, default=0, server_default="0")
+    slack_active_minutes = Column(Float, nullable=False, default=0, server_default="0")
+    slack_positive_messages = Column(Float, nullable=False, default=0, server_default="0")
+
+    # Nominations
+    nominations_received = Column(Float, nullable=False, default=0, server_default="0")
+    avg_sentiment_score = Column(Float, nullable=True)
+
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class EmployeeIdentity(Base):
+    __tablename__ = "employee_identities"
+
+    # External account (Jira accountId, Slack user id) -> employee, matched by email
+    source = Column(String(20), primary_key=True)   # jira, slack
+    external_id = Column(String(128), primary_key=True)
+    employee_id = Column(String(20), ForeignKey("employees.id"), nullable=False, index=True)
+    email = Column(String(150), nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
 class Nomination(Base):
     __tablename__ = "nominations"
 
@@ -87,6 +128,103 @@ class SentimentResult(Base):
 
     # Metadata
     analyzed_at = Column(DateTime, default=datetime.utcnow)
+    model_version = Column(String(64), nullable=True, index=True)  # model/label-set fingerprint
+
+
+class InferenceCache(Base):
+    __tablename__ = "inference_cache"
+
+    # sha256 of normalized comment + claimed core value + model/label-set version
+    cache_key = Column(String(64), primary_key=True)
+    model_version = Column(String(64), nullable=False, index=True)
+
+    sentiment_label = Column(String(20), nullable=True)
+    sentiment_score = Column(Float, nullable=True)
+    predicted_core_value = Column(String(50), nullable=True)
+    core_value_alignment = Column(Integer, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+
+class ReanalysisJob(Base):
+    __tablename__ = "reanalysis_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    status = Column(String(20), nullable=False, default="pending")  # pending, running, done, failed
+    filters = Column(Text, nullable=True)  # JSON: nomination_type, created_from, created_to, manager_id
+
+    # Keyset checkpoint: every nomination with id <= last_nomination_id has been re-scored
+    last_nomination_id = Column(Integer, nullable=False, default=0)
+    processed = Column(Integer, nullable=False, default=0)
+    total = Column(Integer, nullable=True)
+    error = Column(Text, nullable=True)
+
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+
+class JiraIssue(Base):
+    __tablename__ = "jira_issues"
+
+    # Local copy of the project's issues, kept current by the incremental Jira sync
+    key = Column(String(50), primary_key=True)
+    status = Column(String(100), nullable=False, index=True)
+    assignee_account_id = Column(String(128), nullable=True, index=True)
+    assignee_name = Column(String(255), nullable=True)
+    assignee_email = Column(String(255), nullable=True)
+    worklog_seconds = Column(Integer, nullable=False, default=0, server_default="0")
+    # False when only the inline (first) page of worklogs could be summed
+    worklog_complete = Column(Boolean, nullable=False, default=True, server_default="true")
+    updated = Column(DateTime(timezone=True), nullable=True)  # Jira's "updated" field
+    synced_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SyncState(Base):
+    __tablename__ = "sync_state"
+
+    # Watermarks of incremental collectors (e.g. "jira", "slack:<channel id>")
+    name = Column(String(100), primary_key=True)
+    watermark = Column(DateTime(timezone=True), nullable=True)
+    cursor = Column(String(64), nullable=True)  # exact source position, e.g. newest Slack message ts
+    last_full_sync = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class SlackMessage(Base):
+    __tablename__ = "slack_messages"
+    __table_args__ = (
+        Index("ix_slack_messages_user_posted_at", "user_id", "posted_at"),
+        # Keyword candidates still waiting for a model score
+        Index("ix_slack_messages_unscored", "posted_at",
+              postgresql_where=sql_text("text IS NOT NULL AND positive_score IS NULL")),
+    )
+
+    # Local copy of channel history, ingested incrementally by app/slack_metrics.py
+    channel_id = Column(String(32), primary_key=True)
+    ts = Column(String(32), primary_key=True)  # Slack message ts, unique per channel
+    user_id = Column(String(32), nullable=True)
+    posted_at = Column(DateTime(timezone=True), nullable=False, index=True)
+    mentions = Column(ARRAY(String(32)), nullable=False, default=list, server_default="{}")
+    reaction_users = Column(ARRAY(String(32)), nullable=False, default=list, server_default="{}")  # one entry per reaction
+    is_positive = Column(Boolean, nullable=False, default=False, server_default="false")
+    # Only kept in "model" mode, for messages that pass the keyword prefilter (scored offline)
+    text = Column(Text, nullable=True)
+    positive_score = Column(Float, nullable=True)  # model probability of positive sentiment
+
+
+class SlackDailyActivity(Base):
+    __tablename__ = "slack_daily_activity"
+
+    # Per-user, per-day (UTC) rollup of slack_messages, rebuilt for the days touched by each ingestion
+    user_id = Column(String(32), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    messages = Column(Integer, nullable=False, default=0, server_default="0")
+    reactions = Column(Integer, nullable=False, default=0, server_default="0")
+    mentions = Column(Integer, nullable=False, default=0, server_default="0")
+    positive_msgs = Column(Integer, nullable=False, default=0, server_default="0")
+    first_ts = Column(DateTime(timezone=True), nullable=True)  # first/last own message of the day
+    last_ts = Column(DateTime(timezone=True), nullable=True)
 
 
 class PasswordReset(Base):
@@ -0,0 +1,63 @@
+"""
+Labelled gauges published as whole snapshots.
+
+A regular labelled Gauge keeps every label value it has ever seen, so
+assignees and Slack users who leave stay exported forever. SnapshotGauge is
+a custom collector instead: a collector builds the complete {labels: value}
+mapping for one refresh and replace() swaps it in with a single reference
+assignment, so a scrape sees either the old or the new snapshot and labels
+missing from the new one disappear. At most max_series label sets are kept;
+the rest are summed into one "other" series.
+"""
+from prometheus_client.core import GaugeMetricFamily, REGISTRY
+from app.config import settings
+
+OTHER = "other"
+
+
+def top_labels(values: dict, limit: int):
+    """
+    The `limit` keys with the largest values (ties broken by key, so the choice is stable)
+    """
+    if limit is None or len(values) <= limit:
+        return set(values)
+    ranked = sorted(values.items(), key=lambda item: (-item[1], str(item[0])))
+    return {key for key, _ in ranked[:limit]}
+
+
+class SnapshotGauge:
+    def __init__(self, name: str, documentation: str, labelnames, max_series: int = None, registry=REGISTRY):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = list(labelnames)
+        self.max_series = settings.METRICS_MAX_LABEL_VALUES if max_series is None else max_series
+        self._snapshot = {}
+        if registry is not None:
+            registry.register(self)
+
+    def _key(self, labels):
+        return labels if isinstance(labels, tuple) else (labels,)
+
+    def replace(self, values: dict, keep=None):
+        """
+        values: label value (or tuple of label values) -> number. Keys outside
+        `keep` (default: the max_series largest values) are collapsed into "other".
+        """
+        values = {self._key(labels): float(value) for labels, value in values.items()}
+        keep = top_labels(values, self.max_series) if keep is None else {self._key(k) for k in keep}
+
+        snapshot = {}
+        other_key = (OTHER,) * len(self.labelnames)
+        for labels, value in values.items():
+            key = labels if labels in keep else other_key
+            snapshot[key] = snapshot.get(key, 0.0) + value
+        self._snapshot = snapshot
+
+    def describe(self):
+        return [GaugeMetricFamily(self.name, self.documentation, labels=self.labelnames)]
+
+    def collect(self):
+        family = GaugeMetricFamily(self.name, self.documentation, labels=self.labelnames)
+        for labels, value in self._snapshot.items():
+            family.add_metric(list(labels), value)
+        yield family
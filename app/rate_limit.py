@@ -0,0 +1,71 @@
+"""
+Token-bucket rate limiting shared by collector threads.
+
+Each key (e.g. a Slack API method) has its own bucket; acquire() blocks until
+a token is free. pause() empties a bucket for a server-imposed delay
+(Retry-After), so every thread calling that method waits, not just the one
+that was rejected.
+"""
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate_per_minute: float, burst: int = 1):
+        self.rate = rate_per_minute / 60.0   # tokens per second
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def acquire(self):
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                if now < self._paused_until:
+                    wait = self._paused_until - now
+                else:
+                    self._refill(now)
+                    if self._tokens >= 1:
+                        self._tokens -= 1
+                        return
+                    wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+    def pause(self, seconds: float):
+        with self._lock:
+            now = time.monotonic()
+            self._paused_until = max(self._paused_until, now + seconds)
+            self._tokens = 0.0
+            self._updated = self._paused_until
+
+
+class RateLimiter:
+    """
+    Buckets per key, created from limits: key -> (rate_per_minute, burst).
+    Keys without a limit use default.
+    """
+
+    def __init__(self, limits: dict, default=(20, 1)):
+        self.limits = dict(limits)
+        self.default = default
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def bucket(self, key) -> TokenBucket:
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = self._buckets[key] = TokenBucket(*self.limits.get(key, self.default))
+            return bucket
+
+    def acquire(self, key):
+        self.bucket(key).acquire()
+
+    def pause(self, key, seconds: float):
+        self.bucket(key).pause(seconds)
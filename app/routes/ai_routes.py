@@ -1,3 +1,4 @@
+import json
 from datetime import datetime
 from typing import Optional, List
 from fastapi import APIRouter, Depends, HTTPException, Query, status
@@ -5,8 +6,10 @@ from fastapi.security import OAuth2PasswordBearer
 from jose import JWTError, jwt
 from sqlalchemy.orm import Session
 from pydantic import BaseModel
-from app.models import SentimentResult, Employee, User, Nomination
+from app.models import SentimentResult, Employee, User, Nomination, NominationTypeEnum, ReanalysisJob
 from app.db import get_db
+from app.ai import reanalysis
+from app.ai.sentiment import MODEL_VERSION
 
 # ----- CONFIG -----
 SECRET_KEY = "your-secret-key"          # move to settings/env
@@ -49,6 +52,7 @@ class SentimentResultResponse(BaseModel):
     predicted_core_value: Optional[str]
     core_value_alignment: Optional[int]   # <-- CHANGED to int
     analyzed_at: datetime
+    model_version: Optional[str]
 
     class Config:
         orm_mode = True
@@ -60,11 +64,15 @@ def list_sentiment_results(
     nomination_type: Optional[str] = Query("monthly", description="Filter by nomination type: monthly, quarterly, yearly"),
     search: Optional[str] = Query(None, description="Search by employee name"),
     manager_id: Optional[int] = Query(None, description="Filter by manager (superadmin only)"),
+    current_version_only: bool = Query(False, description="Only results from the current model/label-set version"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
     query = db.query(SentimentResult)
 
+    if current_version_only:
+        query = query.filter(SentimentResult.model_version == MODEL_VERSION)
+
     # Role-based access
     if current_user.role == "manager":
         query = query.filter(SentimentResult.manager_id == current_user.id)
@@ -110,7 +118,8 @@ def list_sentiment_results(
             sentiment_score=sr.sentiment_score,
             predicted_core_value=sr.predicted_core_value,
             core_value_alignment=sr.core_value_alignment,
-            analyzed_at=sr.analyzed_at
+            analyzed_at=sr.analyzed_at,
+            model_version=sr.model_version
         ))
 
     return result
@@ -178,4 +187,124 @@ def best_employees_superadmin(
         raise HTTPException(status_code=400, detail="manager_id query param required")
 
     top_employees = get_best_employees(manager_id, db)
-    return {"manager_id": manager_id, "top_employees": top_employees}
\ No newline at end of file
+    return {"manager_id": manager_id, "top_employees": top_employees}
+
+
+# ---- Bulk re-analysis (superadmin only) ----
+class ReanalysisRequest(BaseModel):
+    nomination_type: Optional[str] = None   # monthly, quarterly, yearly
+    created_from: Optional[str] = None      # ISO date or datetime, inclusive
+    created_to: Optional[str] = None        # ISO date (the whole day) or datetime, inclusive
+    manager_id: Optional[int] = None
+    stale_only: bool = False                # only rows not scored by the current model version
+
+
+class ReanalysisJobResponse(BaseModel):
+    job_id: int
+    status: str
+    running: bool
+    filters: dict
+    processed: int
+    total: Optional[int]
+    last_nomination_id: int
+    error: Optional[str]
+    created_at: Optional[datetime]
+    finished_at: Optional[datetime]
+
+
+def _job_response(job: ReanalysisJob) -> ReanalysisJobResponse:
+    return ReanalysisJobResponse(
+        job_id=job.id,
+        status=job.status,
+        running=reanalysis.is_running(job.id),
+        filters=json.loads(job.filters or "{}"),
+        processed=job.processed or 0,
+        total=job.total,
+        last_nomination_id=job.last_nomination_id or 0,
+        error=job.error,
+        created_at=job.created_at,
+        finished_at=job.finished_at,
+    )
+
+
+def _get_job_or_404(job_id: int, db: Session) -> ReanalysisJob:
+    job = db.query(ReanalysisJob).filter(ReanalysisJob.id == job_id).first()
+    if not job:
+        raise HTTPException(status_code=404, detail="Re-analysis job not found")
+    return job
+
+
+@router.post("/superadmin/reanalysis", response_model=ReanalysisJobResponse)
+def start_reanalysis(
+    payload: ReanalysisRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized. Only superadmin can access this.")
+
+    if payload.nomination_type:
+        try:
+            NominationTypeEnum(payload.nomination_type)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid nomination_type")
+    for bound in (payload.created_from, payload.created_to):
+        if bound:
+            try:
+                reanalysis.parse_created_bound(bound)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="created_from/created_to must be ISO dates or datetimes")
+
+    filters = {
+        "nomination_type": payload.nomination_type,
+        "created_from": payload.created_from,
+        "created_to": payload.created_to,
+        "manager_id": payload.manager_id,
+        "stale_only": payload.stale_only or None,
+    }
+    job = reanalysis.create_job(db, {k: v for k, v in filters.items() if v is not None})
+    reanalysis.start_job_in_background(job.id)
+    return _job_response(job)
+
+
+@router.get("/superadmin/reanalysis/{job_id}", response_model=ReanalysisJobResponse)
+def get_reanalysis(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized. Only superadmin can access this.")
+    return _job_response(_get_job_or_404(job_id, db))
+
+
+@router.get("/superadmin/model-version")
+def get_model_version(
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized. Only superadmin can access this.")
+
+    total = db.query(SentimentResult).count()
+    current = db.query(SentimentResult).filter(SentimentResult.model_version == MODEL_VERSION).count()
+    return {"model_version": MODEL_VERSION, "results_total": total, "results_stale": total - current}
+
+
+@router.post("/superadmin/reanalysis/{job_id}/resume", response_model=ReanalysisJobResponse)
+def resume_reanalysis(
+    job_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized. Only superadmin can access this.")
+
+    job = _get_job_or_404(job_id, db)
+    if job.status == "done":
+        raise HTTPException(status_code=400, detail="Re-analysis job already finished")
+    if reanalysis.is_running(job.id):
+        raise HTTPException(status_code=409, detail="Re-analysis job is already running")
+
+    reanalysis.start_job_in_background(job.id)
+    return _job_response(job)
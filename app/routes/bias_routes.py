@@ -0,0 +1,94 @@
+from typing import List, Literal, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.models import User
+from app.routes.manager_routes import get_current_user
+from app.ai.bias_stream import bias_tracker
+from app.ai.bias_sql import detect_bias_sql
+
+
+router = APIRouter(prefix="/bias", tags=["Bias"])
+
+
+class ActivityObservation(BaseModel):
+    employee_id: str
+    manager_id: int
+    jira_tickets: Optional[float] = None
+    slack_activity: Optional[float] = None
+    extra_activities: Optional[float] = None
+    customer_appreciations: Optional[float] = None
+    mode: Literal["set", "increment"] = "set"   # "set" replaces the employee's metrics, "increment" adds to them
+
+
+class BiasFlagResponse(BaseModel):
+    employee_id: str
+    manager_id: int
+    bias_flag: bool
+    deviation_score: float
+
+
+# ---- Ingest activity observations (superadmin only) ----
+@router.post("/observations")
+def ingest_observations(
+    observations: List[ActivityObservation],
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    for obs in observations:
+        metrics = {f: getattr(obs, f) for f in bias_tracker.features}
+        if obs.mode == "increment":
+            bias_tracker.increment(obs.employee_id, obs.manager_id, metrics)
+        else:
+            bias_tracker.observe(obs.employee_id, obs.manager_id, metrics)
+
+    return {"ingested": len(observations), "tracked_employees": len(bias_tracker)}
+
+
+# ---- Current bias flags ----
+@router.get("/flags", response_model=List[BiasFlagResponse])
+def get_bias_flags(
+    manager_id: Optional[int] = Query(None, description="Filter by manager (superadmin only)"),
+    threshold: Optional[float] = Query(None, description="Override the deviation threshold"),
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role == "manager":
+        manager_id = current_user.id
+    elif current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return bias_tracker.flags(manager_id=manager_id, threshold=threshold)
+
+
+# ---- Running statistics for one manager ----
+@router.get("/managers/{manager_id}/stats")
+def get_manager_bias_stats(
+    manager_id: int,
+    current_user: User = Depends(get_current_user),
+):
+    if current_user.role != "superadmin" and current_user.id != manager_id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    stats = bias_tracker.manager_stats(manager_id)
+    if stats is None:
+        raise HTTPException(status_code=404, detail="No activity tracked for this manager")
+    return stats
+
+
+# ---- Bias flags computed in the database (superadmin only) ----
+@router.get("/superadmin/flags", response_model=List[BiasFlagResponse])
+def get_bias_flags_from_db(
+    manager_id: Optional[int] = Query(None, description="Filter by manager"),
+    threshold: Optional[float] = Query(None, description="Override the deviation threshold"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.role != "superadmin":
+        raise HTTPException(status_code=403, detail="Not authorized. Only superadmin can access this.")
+
+    if threshold is None:
+        return detect_bias_sql(db, manager_id=manager_id)
+    return detect_bias_sql(db, manager_id=manager_id, threshold=threshold)
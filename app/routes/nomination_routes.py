@@ -8,8 +8,7 @@ from datetime import datetime
 from app.routes.manager_routes import get_current_user 
 from fastapi import Query
 from app.models import NominationTypeEnum
-from app.ai.sentiment import analyze_nomination
-from app.models import SentimentResult
+from app.ai.analysis_queue import analysis_queue
 from datetime import datetime
 from fastapi import Query
 
@@ -46,6 +45,12 @@ class NominationResponse(BaseModel):
     class Config:
         orm_mode = True
 
+class AnalysisStatusResponse(BaseModel):
+    nomination_id: int
+    status: str                      # pending, running, done, failed, not_found
+    analyzed_at: Optional[datetime]
+    error: Optional[str]
+
 # ---- POST nomination (create or update) ----
 @router.post("/", response_model=NominationResponse)
 def submit_nomination(
@@ -98,62 +103,8 @@ def submit_nomination(
     db.commit()
     db.refresh(nomination)
 
-    # --- AI sentiment analysis (safe defaults if fields missing) ---
-    ai_input = {
-        "nomination_id": nomination.id,
-        "employee_id": employee.id,            # str
-        "manager_id": current_user.id,
-        "core_value_claimed": nomination.core_value,
-        "comment": nomination.justification_text,
-    }
-    ai_result = analyze_nomination(ai_input) or {}
-
-    sentiment_label = ai_result.get("sentiment_label", None)
-    sentiment_score = ai_result.get("sentiment_score", None)
-    predicted_core_value = ai_result.get("predicted_core_value", None)
-    alignment = ai_result.get("core_value_alignment", None)
-
-    # Upsert SentimentResult (PK = nomination_id)
-    existing = db.query(SentimentResult).filter(SentimentResult.nomination_id == nomination.id).first()
-    if existing:
-        existing.employee_id = employee.id           # str
-        existing.manager_id = current_user.id
-        existing.employee_name = employee.name
-        existing.manager_name = current_user.name
-        existing.project_name = nomination.project_name
-        # Enum -> string for SentimentResult
-        existing.nomination_type = (
-            nomination.nomination_type.value
-            if isinstance(nomination.nomination_type, NominationTypeEnum)
-            else str(nomination.nomination_type)
-        )
-        existing.sentiment_label = sentiment_label
-        existing.sentiment_score = sentiment_score
-        existing.predicted_core_value = predicted_core_value
-        existing.core_value_alignment = alignment
-        existing.analyzed_at = datetime.utcnow()
-    else:
-        sr = SentimentResult(
-            nomination_id=nomination.id,
-            employee_id=employee.id,              # str
-            manager_id=current_user.id,
-            employee_name=employee.name,
-            manager_name=current_user.name,
-            project_name=nomination.project_name,
-            nomination_type=(
-                nomination.nomination_type.value
-                if isinstance(nomination.nomination_type, NominationTypeEnum)
-                else str(nomination.nomination_type)
-            ),
-            sentiment_label=sentiment_label,
-            sentiment_score=sentiment_score,
-            predicted_core_value=predicted_core_value,
-            core_value_alignment=alignment,
-            analyzed_at=datetime.utcnow(),
-        )
-        db.add(sr)
-
-    db.commit()
+    # --- AI sentiment analysis runs in the background; poll /nominations/{id}/analysis ---
+    analysis_queue.enqueue(nomination.id)
 
     return NominationResponse(
         id=nomination.id,
@@ -239,3 +190,22 @@ def list_nominations(
             )
         )
     return out
+
+
+# ---- GET analysis status for a nomination ----
+@router.get("/{nomination_id}/analysis", response_model=AnalysisStatusResponse)
+def get_analysis_status(
+    nomination_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.role not in ("manager", "superadmin"):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    nomination = db.query(Nomination).filter(Nomination.id == nomination_id).first()
+    if not nomination:
+        raise HTTPException(status_code=404, detail="Nomination not found")
+    if current_user.role == "manager" and nomination.manager_id != current_user.id:
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    return analysis_queue.status(nomination_id, db)
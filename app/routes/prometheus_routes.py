@@ -2,19 +2,20 @@ from fastapi import APIRouter
 from prometheus_client import generate_latest, CONTENT_TYPE_LATEST
 from fastapi.responses import Response
 from app.jira_metrics import fetch_jira_data
-from app.slack_metrics import get_all_users, get_user_activity
+from app.slack_metrics import fetch_slack_data
+import app.ai.metrics  # noqa: F401  registers nomination analysis metrics (cache, stages, tokens, models)
 
 router = APIRouter()
 
+# Plain def: the collectors block on HTTP and the database, so FastAPI runs this in its
+# threadpool instead of on the event loop
 @router.get("/metrics")
-async def metrics():
+def metrics():
     # JIRA metrics
     fetch_jira_data()
     
     # Slack metrics
-    users = get_all_users()
-    for uid in users:
-        get_user_activity(uid)
+    fetch_slack_data()
     
     data = generate_latest()
     return Response(content=data, media_type=CONTENT_TYPE_LATEST)
\ No newline at end of file
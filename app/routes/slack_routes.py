@@ -0,0 +1,61 @@
+from typing import List, Optional
+from datetime import date
+from fastapi import APIRouter, Depends, HTTPException, Query
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+from app.db import get_db
+from app.models import User, EmployeeIdentity
+from app.routes.manager_routes import get_current_user
+from app.slack_metrics import collect_user_activity, window_bounds
+from app.feature_store import SLACK
+
+
+router = APIRouter(prefix="/slack", tags=["Slack"])
+
+
+class SlackUserActivity(BaseModel):
+    user_id: str
+    employee_id: Optional[str] = None
+    messages: int
+    reactions: int
+    mentions: int
+    positive_msgs: int
+    active_minutes: int
+
+
+class SlackActivityResponse(BaseModel):
+    window: str
+    start: date
+    end: date
+    users: List[SlackUserActivity]
+
+
+# ---- Per-user Slack activity over a window (from the daily rollups) ----
+@router.get("/activity", response_model=SlackActivityResponse)
+def get_slack_activity(
+    window: str = Query("30d", description="'7d', '30d', '90d' (any '<N>d'), 'month' or 'quarter'"),
+    period: Optional[str] = Query(None, description="Month ('2025-08') or quarter ('2025-Q3'); default: current"),
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+):
+    if current_user.role not in ("superadmin", "manager"):
+        raise HTTPException(status_code=403, detail="Not authorized")
+
+    try:
+        start, end = window_bounds(window, period)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=f"Invalid window: {e}")
+
+    activity = collect_user_activity(db, start_day=start, end_day=end)
+    employees = dict(
+        db.query(EmployeeIdentity.external_id, EmployeeIdentity.employee_id)
+        .filter(EmployeeIdentity.source == SLACK, EmployeeIdentity.external_id.in_(list(activity)))
+        .all()
+    ) if activity else {}
+
+    users = [
+        {"user_id": uid, "employee_id": employees.get(uid), **metrics}
+        for uid, metrics in activity.items()
+    ]
+    users.sort(key=lambda u: (-u["messages"], u["user_id"]))
+    return {"window": window, "start": start, "end": end, "users": users}
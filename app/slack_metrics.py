@@ -1,102 +1,421 @@
 # app/slack_metrics.py
 import os
-import requests
-from datetime import datetime
-from prometheus_client import Gauge
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from datetime import date, datetime, timedelta, timezone
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+from app import feature_store
+from app.config import settings
+from app.db import SessionLocal
+from app.http_client import http_client
+from app.models import SlackDailyActivity, SlackMessage, SyncState
+from app.prometheus_snapshot import SnapshotGauge, top_labels
+from app.rate_limit import RateLimiter
 
 
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
-CHANNELS = ["C09AJPQAYCT"]  # Add more if needed
+CHANNELS = [channel.strip() for channel in settings.SLACK_CHANNELS.split(",") if channel.strip()]
 
-START_DATE = datetime(2025, 8, 1)
-END_DATE = datetime(2025, 8, 31, 23, 59, 59)
-START_TS = START_DATE.timestamp()
-END_TS = END_DATE.timestamp()
+SLACK_API_URL = "https://slack.com/api/{method}"
+# Web API rate-limit tiers per method: (requests per minute, burst)
+SLACK_METHOD_LIMITS = {
+    "users.list": (20, 2),               # Tier 2
+    "conversations.history": (50, 5),    # Tier 3
+}
+slack_rate_limiter = RateLimiter(SLACK_METHOD_LIMITS)
+
+# pg_advisory_xact_lock key guarding rebuild_daily_rollups
+ROLLUP_LOCK_KEY = 0x51AC_0001
 
 POSITIVE_KEYWORDS = ["thanks", "great", "awesome", "good job", "well done", "nice", "appreciate"]
 
-# Prometheus Gauges
-slack_messages = Gauge("slack_messages_total", "Total Slack messages per user", ["user"])
-slack_reactions = Gauge("slack_reactions_total", "Total Slack reactions per user", ["user"])
-slack_mentions = Gauge("slack_mentions_total", "Total Slack mentions per user", ["user"])
-slack_active_minutes = Gauge("slack_active_minutes_total", "Total active minutes per user", ["user"])
-slack_positive_msgs = Gauge("slack_positive_messages_total", "Total positive messages per user", ["user"])
+# Prometheus Gauges (whole snapshots, see publish_user_metrics)
+slack_messages = SnapshotGauge("slack_messages_total", "Total Slack messages per user", ["user"])
+slack_reactions = SnapshotGauge("slack_reactions_total", "Total Slack reactions per user", ["user"])
+slack_mentions = SnapshotGauge("slack_mentions_total", "Total Slack mentions per user", ["user"])
+slack_active_minutes = SnapshotGauge("slack_active_minutes_total", "Total active minutes per user", ["user"])
+slack_positive_msgs = SnapshotGauge("slack_positive_messages_total", "Total positive messages per user", ["user"])
+
+USER_GAUGES = {
+    "messages": slack_messages,
+    "reactions": slack_reactions,
+    "mentions": slack_mentions,
+    "active_minutes": slack_active_minutes,
+    "positive_msgs": slack_positive_msgs,
+}
+
+
+
+def slack_api(method, params):
+    """
+    Call a Slack Web API method within its tier's rate limit. A 429 pauses the
+    method's bucket for Retry-After, so concurrent callers back off together.
+    """
+    slack_rate_limiter.acquire(method)
+    response = http_client.get(
+        SLACK_API_URL.format(method=method),
+        headers={"Authorization": f"Bearer {SLACK_BOT_TOKEN}"},
+        params=params,
+        on_rate_limited=lambda delay: slack_rate_limiter.pause(method, delay),
+    )
+    if response.status_code == 429:
+        return {"ok": False, "error": "ratelimited"}
+    return response.json()
+
+
+# Slack user id -> email (needs the users:read.email scope), used to map users to employees
+user_emails = {}
 
 def get_all_users():
-    url = "https://slack.com/api/users.list"
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
+    """
+    Active human users as {user_id: real_name}. Raises RuntimeError if any page
+    fails, so callers never mistake a partial list for the whole workspace.
+    """
     params = {"limit": 200}
     users = {}
     next_cursor = None
     while True:
         if next_cursor:
             params["cursor"] = next_cursor
-        response = requests.get(url, headers=headers, params=params)
-        data = response.json()
+        data = slack_api("users.list", params)
         if not data.get("ok"):
-            print("Error fetching users:", data.get("error"))
-            break
+            raise RuntimeError(f"users.list failed: {data.get('error')}")
         for member in data.get("members", []):
             user_id = member.get("id")
             real_name = member.get("real_name", member.get("name"))
             if not member.get("is_bot") and not member.get("deleted"):
                 users[user_id] = real_name
+                user_emails[user_id] = member.get("profile", {}).get("email")
         next_cursor = data.get("response_metadata", {}).get("next_cursor")
         if not next_cursor:
             break
     return users
 
-def get_user_activity(user_id):
-    # Same logic as your get_user_activity function, but simplified to update Gauges
-    metrics = {"messages": 0, "reactions": 0, "mentions": 0, "active_minutes": 0, "positive_msgs": 0}
-    headers = {"Authorization": f"Bearer {SLACK_BOT_TOKEN}"}
-    timestamps = []
-
-    for channel_id in CHANNELS:
-        url = "https://slack.com/api/conversations.history"
-        params = {"channel": channel_id, "limit": 200, "oldest": START_TS, "latest": END_TS}
-        next_cursor = None
-        while True:
-            if next_cursor:
-                params["cursor"] = next_cursor
-            response = requests.get(url, headers=headers, params=params)
-            data = response.json()
-            if not data.get("ok"):
-                print(f"Error fetching messages for {user_id}:", data.get("error"))
-                break
-            for msg in data.get("messages", []):
-                if msg.get("user") == user_id:
-                    metrics["messages"] += 1
-                    timestamps.append(float(msg["ts"]))
-                    text = msg.get("text", "").lower()
-                    if any(word in text for word in POSITIVE_KEYWORDS):
-                        metrics["positive_msgs"] += 1
-                for reaction in msg.get("reactions", []):
-                    if user_id in reaction.get("users", []):
-                        metrics["reactions"] += 1
-                if f"<@{user_id}>" in msg.get("text", ""):
-                    metrics["mentions"] += 1
-            next_cursor = data.get("response_metadata", {}).get("next_cursor")
-            if not next_cursor:
-                break
-
-    # Calculate active minutes
-    daily_activity = {}
-    for ts in timestamps:
-        day = datetime.fromtimestamp(ts).date()
-        if day not in daily_activity:
-            daily_activity[day] = {"start": ts, "end": ts}
+MENTION_PATTERN = re.compile(r"<@([A-Z0-9]+)(?:\|[^>]*)?>")
+
+
+def _empty_metrics():
+    return {"messages": 0, "reactions": 0, "mentions": 0, "active_minutes": 0, "positive_msgs": 0}
+
+
+def iter_channel_messages(channel_id, oldest, latest=None):
+    """
+    Page through conversations.history of one channel (latest=None: up to now).
+    Raises on an API error: a partial read must not advance the high-water mark.
+    """
+    params = {"channel": channel_id, "limit": 200, "oldest": oldest}
+    if latest is not None:
+        params["latest"] = latest
+    while True:
+        data = slack_api("conversations.history", params)
+        if not data.get("ok"):
+            raise RuntimeError(f"conversations.history failed for channel {channel_id}: {data.get('error')}")
+        yield from data.get("messages", [])
+        next_cursor = data.get("response_metadata", {}).get("next_cursor")
+        if not next_cursor:
+            return
+        params["cursor"] = next_cursor
+
+
+# ---- Local message store (slack_messages) ----
+_ingest_lock = threading.Lock()
+
+
+def _is_positive(text):
+    lowered = text.lower()
+    return any(word in lowered for word in POSITIVE_KEYWORDS)
+
+
+def _message_row(channel_id, msg):
+    text = msg.get("text", "")
+    reaction_users = []
+    for reaction in msg.get("reactions", []):
+        reaction_users.extend(set(reaction.get("users", [])))
+    # The keyword scan is the verdict in "keyword" mode and the prefilter for model scoring
+    keyword_match = _is_positive(text)
+    return {
+        "channel_id": channel_id,
+        "ts": msg["ts"],
+        "user_id": msg.get("user"),
+        "posted_at": datetime.fromtimestamp(float(msg["ts"]), tz=timezone.utc),
+        "mentions": sorted(set(MENTION_PATTERN.findall(text))),
+        "reaction_users": reaction_users,
+        "is_positive": keyword_match,
+        # Message text is only stored for the scoring job to read
+        "text": text if keyword_match and settings.SLACK_POSITIVE_MODE == "model" else None,
+    }
+
+
+def _upsert_messages(db, rows):
+    stmt = insert(SlackMessage).values(rows)
+    existing = SlackMessage.__table__.c
+    text_changed = existing.text.is_distinct_from(stmt.excluded.text)
+    set_ = {column: stmt.excluded[column] for column in ("user_id", "mentions", "reaction_users", "text")}
+    # A stored model score stays valid until the text is edited
+    set_["positive_score"] = case((text_changed, None), else_=existing.positive_score)
+    if settings.SLACK_POSITIVE_MODE == "model":
+        set_["is_positive"] = case(
+            (text_changed | existing.positive_score.is_(None), stmt.excluded.is_positive),
+            else_=existing.is_positive,
+        )
+    else:
+        set_["is_positive"] = stmt.excluded.is_positive
+    stmt = stmt.on_conflict_do_update(index_elements=[SlackMessage.channel_id, SlackMessage.ts], set_=set_)
+    db.execute(stmt)
+
+
+def _ingest_oldest(state):
+    if state.cursor:
+        return float(state.cursor) - settings.SLACK_REACTION_LOOKBACK_HOURS * 3600
+    return (datetime.now(timezone.utc) - timedelta(days=settings.SLACK_BACKFILL_DAYS)).timestamp()
+
+
+def fetch_channel(channel_id, oldest):
+    """
+    Read one channel's messages after oldest (runs in a fetcher thread, no
+    database access). Returns (message rows, newest ts or None).
+    """
+    rows = []
+    newest = None
+    for msg in iter_channel_messages(channel_id, oldest=oldest):
+        rows.append(_message_row(channel_id, msg))
+        if newest is None or float(msg["ts"]) > float(newest):
+            newest = msg["ts"]
+    return rows, newest
+
+
+def ingest_slack_messages(db, channels=None) -> int:
+    """
+    Store messages newer than each channel's high-water mark (newest ts
+    seen), re-reading the last SLACK_REACTION_LOOKBACK_HOURS so reactions and
+    edits on recent messages are picked up. Channels are fetched concurrently
+    (SLACK_FETCH_WORKERS threads, sharing the per-method rate limits); rows
+    are written and the touched days re-rolled up on this thread, in one
+    transaction. Returns the number of messages read.
+    """
+    channels = CHANNELS if channels is None else channels
+    states = {}
+    for channel_id in channels:
+        name = f"slack:{channel_id}"
+        state = db.get(SyncState, name)
+        if state is None:
+            state = SyncState(name=name)
+            db.add(state)
+        states[channel_id] = state
+
+    read = 0
+    touched_days = set()
+    workers = max(1, min(settings.SLACK_FETCH_WORKERS, len(channels) or 1))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="slack-fetch") as pool:
+        futures = {
+            pool.submit(fetch_channel, channel_id, _ingest_oldest(state)): channel_id
+            for channel_id, state in states.items()
+        }
+        for future in as_completed(futures):
+            channel_id = futures[future]
+            try:
+                rows, newest = future.result()
+            except Exception as e:
+                print(f"Error ingesting Slack channel {channel_id}:", e)
+                continue
+            for i in range(0, len(rows), 500):
+                _upsert_messages(db, rows[i:i + 500])
+            touched_days.update(row["posted_at"].date() for row in rows)
+            read += len(rows)
+
+            state = states[channel_id]
+            if newest is not None and (state.cursor is None or float(newest) > float(state.cursor)):
+                state.cursor = newest
+                state.watermark = datetime.fromtimestamp(float(newest), tz=timezone.utc)
+
+    rebuild_daily_rollups(db, touched_days)
+    db.commit()
+    return read
+
+
+# ---- Daily per-user rollups (slack_daily_activity) ----
+def _utc_day(column):
+    return func.date(func.timezone("UTC", column))
+
+
+def rebuild_daily_rollups(db, days):
+    """
+    Recompute the rollup rows of the given UTC days from slack_messages
+    (every channel), so re-read messages and new reactions are not double counted
+    """
+    days = sorted(days)
+    if not days:
+        return
+    # Serialize rebuilds (metrics refresh, scoring job, other API workers) until commit;
+    # taken before aggregating so each rebuild counts the messages the previous one committed
+    db.execute(select(func.pg_advisory_xact_lock(ROLLUP_LOCK_KEY)))
+    day = _utc_day(SlackMessage.posted_at).label("day")
+    # Coarse range filter first so posted_at's index is used, then the exact days
+    in_days = (
+        SlackMessage.posted_at >= datetime.combine(days[0], datetime.min.time(), tzinfo=timezone.utc),
+        SlackMessage.posted_at < datetime.combine(days[-1] + timedelta(days=1), datetime.min.time(), tzinfo=timezone.utc),
+        day.in_(days),
+    )
+
+    rows = {}
+
+    def row(user_id, d):
+        return rows.setdefault((user_id, d), {
+            "user_id": user_id, "day": d, "messages": 0, "reactions": 0, "mentions": 0,
+            "positive_msgs": 0, "first_ts": None, "last_ts": None,
+        })
+
+    authored = (
+        db.query(
+            SlackMessage.user_id, day,
+            func.count().label("messages"),
+            func.sum(case((SlackMessage.is_positive, 1), else_=0)).label("positive_msgs"),
+            func.min(SlackMessage.posted_at).label("first_ts"),
+            func.max(SlackMessage.posted_at).label("last_ts"),
+        )
+        .filter(SlackMessage.user_id.isnot(None), *in_days)
+        .group_by(SlackMessage.user_id, day)
+    )
+    for r in authored:
+        entry = row(r.user_id, r.day)
+        entry.update(messages=r.messages, positive_msgs=r.positive_msgs, first_ts=r.first_ts, last_ts=r.last_ts)
+
+    # Reactions and mentions: one row per (message, user) entry in the arrays
+    for column, field in ((SlackMessage.reaction_users, "reactions"), (SlackMessage.mentions, "mentions")):
+        entries = db.query(func.unnest(column).label("user_id"), day).filter(*in_days).subquery()
+        for user_id, d, count in (
+            db.query(entries.c.user_id, entries.c.day, func.count()).group_by(entries.c.user_id, entries.c.day)
+        ):
+            row(user_id, d)[field] = count
+
+    db.query(SlackDailyActivity).filter(SlackDailyActivity.day.in_(days)).delete(synchronize_session=False)
+    if rows:
+        stmt = insert(SlackDailyActivity).values(list(rows.values()))
+        db.execute(stmt.on_conflict_do_update(
+            index_elements=[SlackDailyActivity.user_id, SlackDailyActivity.day],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("messages", "reactions", "mentions", "positive_msgs", "first_ts", "last_ts")
+            },
+        ))
+
+
+def window_bounds(window: str, period: str = None, today: date = None):
+    """
+    First and last day (inclusive, UTC) of an activity window:
+    "7d"/"30d"/"90d" (any "<N>d") end today; "month" and "quarter" are the
+    current calendar month/quarter, or the one named by period
+    ("2025-08", "2025-Q3").
+    """
+    today = today or datetime.now(timezone.utc).date()
+    match = re.fullmatch(r"(\d+)d", window)
+    if match:
+        days = int(match.group(1))
+        if not 1 <= days <= 366:
+            raise ValueError("Day windows must be between 1d and 366d")
+        return today - timedelta(days=days - 1), today
+
+    if window == "month":
+        if period:
+            year, month = (int(part) for part in period.split("-"))
+        else:
+            year, month = today.year, today.month
+        start = date(year, month, 1)
+        end = date(year + month // 12, month % 12 + 1, 1) - timedelta(days=1)
+        return start, end
+
+    if window == "quarter":
+        if period:
+            year, quarter = period.upper().split("-Q")
+            year, quarter = int(year), int(quarter)
+            if not 1 <= quarter <= 4:
+                raise ValueError("Quarter must be Q1-Q4")
         else:
-            daily_activity[day]["start"] = min(daily_activity[day]["start"], ts)
-            daily_activity[day]["end"] = max(daily_activity[day]["end"], ts)
-    total_minutes = sum((v["end"] - v["start"]) / 60 for v in daily_activity.values())
-    metrics["active_minutes"] = int(total_minutes)
-
-    # Update Prometheus Gauges
-    user_label = user_id
-    slack_messages.labels(user=user_label).set(metrics["messages"])
-    slack_reactions.labels(user=user_label).set(metrics["reactions"])
-    slack_mentions.labels(user=user_label).set(metrics["mentions"])
-    slack_active_minutes.labels(user=user_label).set(metrics["active_minutes"])
-    slack_positive_msgs.labels(user=user_label).set(metrics["positive_msgs"])
+            year, quarter = today.year, (today.month - 1) // 3 + 1
+        start = date(year, 3 * quarter - 2, 1)
+        end = date(year + quarter // 4, (3 * quarter) % 12 + 1, 1) - timedelta(days=1)
+        return start, end
+
+    raise ValueError("window must be '<N>d', 'month' or 'quarter'")
+
+
+def collect_user_activity(db, user_ids=None, start_day: date = None, end_day: date = None):
+    """
+    Per-user activity summed over the daily rollups between start_day and
+    end_day (default: SLACK_METRICS_WINDOW ending today), for user_ids or every
+    user with activity:
+    {user_id: {"messages", "reactions", "mentions", "active_minutes", "positive_msgs"}}
+    """
+    if start_day is None or end_day is None:
+        start_day, end_day = window_bounds(settings.SLACK_METRICS_WINDOW)
+
+    activity = {uid: _empty_metrics() for uid in user_ids} if user_ids is not None else {}
+    query = db.query(
+        SlackDailyActivity.user_id,
+        func.sum(SlackDailyActivity.messages).label("messages"),
+        func.sum(SlackDailyActivity.reactions).label("reactions"),
+        func.sum(SlackDailyActivity.mentions).label("mentions"),
+        func.sum(SlackDailyActivity.positive_msgs).label("positive_msgs"),
+        func.coalesce(func.sum(
+            func.extract("epoch", SlackDailyActivity.last_ts - SlackDailyActivity.first_ts)
+        ), 0).label("active_seconds"),
+    ).filter(SlackDailyActivity.day.between(start_day, end_day))
+    if user_ids is not None:
+        if not activity:
+            return activity
+        query = query.filter(SlackDailyActivity.user_id.in_(list(activity)))
+
+    for r in query.group_by(SlackDailyActivity.user_id):
+        activity[r.user_id] = {
+            "messages": int(r.messages),
+            "reactions": int(r.reactions),
+            "mentions": int(r.mentions),
+            "active_minutes": int(float(r.active_seconds) / 60),
+            "positive_msgs": int(r.positive_msgs),
+        }
+    return activity
+
+
+def fetch_slack_data():
+    """
+    Ingest new messages, then refresh the per-user gauges and employee features from the store
+    """
+    if not SLACK_BOT_TOKEN:
+        print("Slack token not set!")
+        return
+
+    db = SessionLocal()
+    try:
+        # A concurrent refresh is already ingesting; use what is stored
+        if _ingest_lock.acquire(blocking=False):
+            try:
+                ingest_slack_messages(db)
+            finally:
+                _ingest_lock.release()
+        # Raises on an incomplete list: the gauges and features keep their last snapshot
+        # rather than dropping every user a failed page would have returned
+        users = get_all_users()
+        activity = collect_user_activity(db, users)
+        publish_user_metrics(activity)
+        feature_store.update_slack_features(db, activity, {uid: user_emails.get(uid) for uid in users})
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        print("Error fetching Slack data:", e)
+    finally:
+        db.close()
+
+
+def publish_user_metrics(activity: dict):
+    """
+    Replace the per-user gauges with one refresh's {user_id: metrics}. The
+    same users (most active by messages + reactions + mentions) get their own
+    series in every gauge; the rest are summed into "other".
+    """
+    engagement = {uid: m["messages"] + m["reactions"] + m["mentions"] for uid, m in activity.items()}
+    keep = top_labels(engagement, slack_messages.max_series)
+    for field, gauge in USER_GAUGES.items():
+        gauge.replace({uid: m[field] for uid, m in activity.items()}, keep=keep)
@@ -0,0 +1,91 @@
+"""
+Benchmark the vectorized detect_bias against the original groupby/iterrows loop.
+
+Usage (from the repo root):
+    python -m benchmarks.bias_detection
+    python -m benchmarks.bias_detection --rows 100000 1000000 --managers-per-1k 10 --legacy-max-rows 1000000
+"""
+import argparse
+import time
+import numpy as np
+import pandas as pd
+from sklearn.preprocessing import MinMaxScaler
+from app.ai.bias import detect_bias, NUMERIC_COLS
+
+
+def legacy_detect_bias(employee_data: pd.DataFrame):
+    """
+    The implementation detect_bias replaced (kept here as the baseline)
+    """
+    scaler = MinMaxScaler()
+    employee_data[NUMERIC_COLS] = scaler.fit_transform(employee_data[NUMERIC_COLS])
+
+    results = []
+    for manager_id, group in employee_data.groupby("manager_id"):
+        mean_scores = group[NUMERIC_COLS].mean()
+        for _, row in group.iterrows():
+            deviation = abs(row[NUMERIC_COLS] - mean_scores).mean()
+            if deviation > 0.4:
+                results.append({
+                    "employee_id": row["employee_id"],
+                    "manager_id": manager_id,
+                    "bias_flag": True,
+                    "deviation_score": deviation
+                })
+    return results
+
+
+def synthetic_employees(rows: int, managers: int, seed: int = 7):
+    rng = np.random.default_rng(seed)
+    frame = pd.DataFrame({
+        "employee_id": [f"EMP{i:07d}" for i in range(rows)],
+        "manager_id": rng.integers(1, managers + 1, size=rows),
+        "jira_tickets": rng.poisson(20, size=rows),
+        "slack_activity": rng.gamma(2.0, 50.0, size=rows),
+        "extra_activities": rng.poisson(2, size=rows),
+        "customer_appreciations": rng.poisson(1, size=rows),
+        "bmi": rng.normal(24, 3, size=rows),
+        "annual_roles": rng.integers(1, 4, size=rows),
+    })
+    # A few outliers per manager so the threshold actually flags someone
+    outliers = rng.random(rows) < 0.01
+    frame.loc[outliers, NUMERIC_COLS] = frame.loc[outliers, NUMERIC_COLS] * 8
+    return frame
+
+
+def timed(fn, frame):
+    start = time.perf_counter()
+    result = fn(frame)
+    return result, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rows", type=int, nargs="+", default=[100_000, 1_000_000])
+    parser.add_argument("--managers-per-1k", type=int, default=10)
+    parser.add_argument("--legacy-max-rows", type=int, default=1_000_000,
+                        help="skip the (slow) legacy run above this size")
+    args = parser.parse_args()
+
+    print(f"{'rows':>10}{'managers':>10}{'flagged':>10}{'vectorized s':>14}{'legacy s':>12}{'speedup':>10}{'match':>8}")
+    for rows in args.rows:
+        managers = max(1, rows * args.managers_per_1k // 1000)
+        frame = synthetic_employees(rows, managers)
+
+        fast, fast_s = timed(detect_bias, frame.copy())
+
+        legacy_s, speedup, match = None, "-", "-"
+        if rows <= args.legacy_max_rows:
+            slow, legacy_s = timed(legacy_detect_bias, frame.copy())
+            speedup = f"{legacy_s / fast_s:.0f}x"
+            match = (
+                [r["employee_id"] for r in fast] == [r["employee_id"] for r in slow]
+                and np.allclose([r["deviation_score"] for r in fast], [r["deviation_score"] for r in slow])
+            )
+
+        legacy_col = f"{legacy_s:.2f}" if legacy_s is not None else "skipped"
+        print(f"{rows:>10}{managers:>10}{len(fast):>10}{fast_s:>14.3f}{legacy_col:>12}{speedup:>10}{str(match):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""
+Accuracy / latency comparison of the core value classifiers on a labelled sample.
+
+Usage (from the repo root):
+    python -m benchmarks.core_value_classifier
+    python -m benchmarks.core_value_classifier --sample benchmarks/data/core_value_sample.json --repeat 3
+"""
+import argparse
+import json
+import time
+import numpy as np
+from transformers import pipeline
+from app.ai.core_values import CORE_VALUES, EmbeddingCoreValueClassifier
+
+
+def load_sample(path):
+    with open(path, "r") as f:
+        rows = json.load(f)
+    return [r["comment"] for r in rows], [r["core_value"] for r in rows]
+
+
+def nli_classifier():
+    model = pipeline("zero-shot-classification")
+
+    def classify(texts):
+        preds = model(texts, CORE_VALUES)
+        if isinstance(preds, dict):
+            preds = [preds]
+        return [p["labels"][0] for p in preds]
+    return classify
+
+
+def embedding_classifier(model_name):
+    model = EmbeddingCoreValueClassifier(model_name)
+    return model.classify
+
+
+def run(name, classify, comments, labels, repeat):
+    # Warm-up pass so lazy init is not counted
+    classify(comments[:1])
+
+    per_item = []
+    predictions = None
+    for _ in range(repeat):
+        predictions = []
+        for comment in comments:
+            start = time.perf_counter()
+            predictions.extend(classify([comment]))
+            per_item.append(time.perf_counter() - start)
+
+    start = time.perf_counter()
+    classify(comments)
+    batch_seconds = time.perf_counter() - start
+
+    accuracy = sum(p == y for p, y in zip(predictions, labels)) / len(labels)
+    per_item_ms = np.array(per_item) * 1000
+    return {
+        "classifier": name,
+        "accuracy": round(accuracy, 3),
+        "p50_ms": round(float(np.percentile(per_item_ms, 50)), 1),
+        "p95_ms": round(float(np.percentile(per_item_ms, 95)), 1),
+        "batch_items_per_s": round(len(comments) / batch_seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", default="benchmarks/data/core_value_sample.json")
+    parser.add_argument("--embedding-model", default="sentence-transformers/all-MiniLM-L6-v2")
+    parser.add_argument("--repeat", type=int, default=1)
+    args = parser.parse_args()
+
+    comments, labels = load_sample(args.sample)
+    results = [
+        run("nli", nli_classifier(), comments, labels, args.repeat),
+        run("embedding", embedding_classifier(args.embedding_model), comments, labels, args.repeat),
+    ]
+
+    print(f"{len(comments)} labelled comments")
+    print(f"{'classifier':<12}{'accuracy':>10}{'p50 ms':>10}{'p95 ms':>10}{'batch/s':>10}")
+    for r in results:
+        print(f"{r['classifier']:<12}{r['accuracy']:>10}{r['p50_ms']:>10}{r['p95_ms']:>10}{r['batch_items_per_s']:>10}")
+
+
+if __name__ == "__main__":
+    main()
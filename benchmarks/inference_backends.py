@@ -0,0 +1,99 @@
+"""
+Compare the torch and onnx (int8) inference backends for the sentiment and zero-shot models.
+
+Reports load time, per-comment latency, batch throughput, resident memory and
+label agreement with the torch backend. Each backend runs in a fresh process so
+RSS numbers are not polluted by the other one.
+
+Usage (from the repo root, with the usual .env settings available):
+    python -m benchmarks.inference_backends
+    python -m benchmarks.inference_backends --sample benchmarks/data/core_value_sample.json --batch-size 16
+"""
+import argparse
+import json
+import multiprocessing
+import time
+import numpy as np
+
+BACKENDS = ("torch", "onnx")
+
+
+def rss_mb():
+    from app.ai.registry import current_rss_bytes
+    return current_rss_bytes() / 2**20
+
+
+def run_backend(backend, comments, batch_size):
+    from app.config import settings
+    from app.ai.backends import build_pipeline
+    from app.ai.core_values import CORE_VALUES
+
+    rss_start = rss_mb()
+    start = time.perf_counter()
+    sentiment_model = build_pipeline("sentiment-analysis", settings.SENTIMENT_MODEL, backend=backend)
+    core_value_model = build_pipeline("zero-shot-classification", settings.ZERO_SHOT_MODEL, backend=backend)
+    load_seconds = time.perf_counter() - start
+
+    # Warm-up
+    sentiment_model(comments[:1])
+    core_value_model(comments[:1], CORE_VALUES)
+
+    sentiment_ms, core_value_ms = [], []
+    sentiment_labels, core_value_labels = [], []
+    for comment in comments:
+        t0 = time.perf_counter()
+        sentiment_labels.append(sentiment_model(comment, truncation=True)[0]["label"])
+        t1 = time.perf_counter()
+        core_value_labels.append(core_value_model(comment, CORE_VALUES)["labels"][0])
+        t2 = time.perf_counter()
+        sentiment_ms.append((t1 - t0) * 1000)
+        core_value_ms.append((t2 - t1) * 1000)
+
+    start = time.perf_counter()
+    sentiment_model(comments, batch_size=batch_size, truncation=True)
+    core_value_model(comments, CORE_VALUES, batch_size=batch_size)
+    batch_seconds = time.perf_counter() - start
+
+    return {
+        "backend": backend,
+        "load_s": round(load_seconds, 1),
+        "rss_mb": round(rss_mb() - rss_start),
+        "sentiment_p50_ms": round(float(np.percentile(sentiment_ms, 50)), 1),
+        "sentiment_p95_ms": round(float(np.percentile(sentiment_ms, 95)), 1),
+        "zero_shot_p50_ms": round(float(np.percentile(core_value_ms, 50)), 1),
+        "zero_shot_p95_ms": round(float(np.percentile(core_value_ms, 95)), 1),
+        "batch_items_per_s": round(len(comments) / batch_seconds, 1),
+        "sentiment_labels": sentiment_labels,
+        "core_value_labels": core_value_labels,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sample", default="benchmarks/data/core_value_sample.json")
+    parser.add_argument("--batch-size", type=int, default=16)
+    args = parser.parse_args()
+
+    with open(args.sample, "r") as f:
+        comments = [row["comment"] for row in json.load(f)]
+
+    ctx = multiprocessing.get_context("spawn")
+    results = []
+    for backend in BACKENDS:
+        with ctx.Pool(1) as pool:
+            results.append(pool.apply(run_backend, (backend, comments, args.batch_size)))
+
+    reference = results[0]
+    columns = ["backend", "load_s", "rss_mb", "sentiment_p50_ms", "sentiment_p95_ms",
+               "zero_shot_p50_ms", "zero_shot_p95_ms", "batch_items_per_s"]
+    print(f"{len(comments)} comments, batch size {args.batch_size}")
+    print("".join(f"{c:>18}" for c in columns + ["sentiment_agree", "core_value_agree"]))
+    for r in results:
+        sentiment_agree = np.mean([a == b for a, b in zip(r["sentiment_labels"], reference["sentiment_labels"])])
+        core_value_agree = np.mean([a == b for a, b in zip(r["core_value_labels"], reference["core_value_labels"])])
+        row = [r[c] for c in columns] + [f"{sentiment_agree:.1%}", f"{core_value_agree:.1%}"]
+        print("".join(f"{str(v):>18}" for v in row))
+
+
+if __name__ == "__main__":
+    main()